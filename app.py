@@ -36,6 +36,13 @@ def create_app():
     login_manager.init_app(app)
     login_manager.login_view = 'auth.login'
     csrf.init_app(app)
+    
+    from services.attempt_buffer import attempt_buffer
+    attempt_buffer.init_app(app)
+    from services.content_provider import content_provider
+    content_provider.init_app(app)
+    from services.leaderboard import leaderboards
+    leaderboards.init_app(app)
 
     # Make csrf_token() available in templates
     @app.context_processor
@@ -52,6 +59,10 @@ def create_app():
         except Exception:
             return []
     
+    # Cached per-concept fragments for lesson pages
+    from services.fragments import cached_fragment
+    app.jinja_env.globals['cached_fragment'] = cached_fragment
+    
     # Register blueprints
     from routes.main import main_bp
     from routes.auth import auth_bp
@@ -67,30 +78,16 @@ def create_app():
     app.register_blueprint(progress_bp, url_prefix='/progress')
     app.register_blueprint(guest_bp, url_prefix='/guest')
     
-    # Create database tables
-    with app.app_context():
-        db.create_all()
-        # Auto-seed if database is empty (first deploys)
-        try:
-            from models.concept import Concept
-            if Concept.query.count() == 0:
-                # Import here to avoid circular imports at module import time
-                import seed_data as seeder
-                seeder.seed_concepts()
-                seeder.seed_practice_problems()
-                seeder.seed_transformations()
-                seeder.seed_additional_8th_grade_concepts()
-            else:
-                # Ensure transformations exist even if base seed ran earlier
-                import seed_data as seeder
-                seeder.seed_transformations()
-                seeder.seed_additional_8th_grade_concepts()
-        except Exception:
-            # Fail silently to avoid blocking app startup in production
-            pass
+    # Schema creation and seeding run from the CLI (`flask setup`), not at boot
+    from commands import register_commands
+    register_commands(app)
     
     return app
 
 if __name__ == '__main__':
     app = create_app()
+    with app.app_context():
+        from services.seeding import migrate, seed
+        migrate()
+        seed()
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,100 @@
+"""
+Dashboard benchmark: a 200-concept curriculum with every concept completed
+
+    python benchmarks/dashboard.py [--concepts 200] [--renders 50]
+
+Builds a throwaway SQLite database with a chain of concepts and a
+student who has completed all of them, then times building the learning
+path, rendering dashboard.html from a prepared context, and the whole
+GET /dashboard request (queries included).
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--concepts', type=int, default=200)
+    parser.add_argument('--renders', type=int, default=50)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(directory, 'bench.db')
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from flask import render_template
+    from flask_login import login_user
+    from sqlalchemy import insert
+    from app import create_app, db
+    from models.concept import Concept
+    from models.progress import ProgressRecord
+    from models.user import User, CompletionBitmap
+    from routes.main import build_learning_path
+    from services.curriculum import get_curriculum_graph, get_ordered_concepts
+    from services.seeding import migrate
+
+    app = create_app()
+    app.config['WTF_CSRF_ENABLED'] = False
+    app.instance_path = directory
+    count = args.concepts
+    with app.app_context():
+        migrate()
+        db.session.add_all(
+            Concept(id=i, name=f'Concept {i}', slug=f'concept-{i}', description='Benchmark concept',
+                    order_in_curriculum=i, category='Benchmark', lesson_content='',
+                    prerequisites=f'concept-{i - 1}' if i > 1 else '')
+            for i in range(1, count + 1)
+        )
+        user = User(username='student', email='student@example.com', total_score=0,
+                    concepts_completed=count,
+                    completion_bitmap=CompletionBitmap.from_ids(range(1, count + 1)).to_bytes())
+        user.set_password('secret1')
+        db.session.add(user)
+        db.session.flush()
+        db.session.execute(insert(ProgressRecord), [
+            {'user_id': user.id, 'concept_id': i, 'score': 90, 'attempts': 3, 'time_spent': 60, 'completed': True}
+            for i in range(1, count + 1)
+        ])
+        db.session.commit()
+        user_id = user.id
+
+    print(f'{count} concepts, all completed; mean of {args.renders} runs after one warm-up')
+    with app.test_request_context('/dashboard'):
+        user = db.session.get(User, user_id)
+        login_user(user)
+        concepts = get_ordered_concepts()
+        graph = get_curriculum_graph()
+        records = ProgressRecord.query.filter_by(user_id=user_id).all()
+        completed = user.get_completed_concepts()
+
+        def learning_path():
+            return build_learning_path(concepts, records, completed, graph)
+
+        context = {
+            'concepts': concepts, 'total_score': 0, 'learning_path': learning_path(),
+            'completed_concepts': completed, 'progress_percentage': 100, 'next_concept': None,
+        }
+        timed('build_learning_path', learning_path, args.renders)
+        timed('render dashboard.html', lambda: render_template('dashboard.html', **context), args.renders)
+
+    client = app.test_client()
+    client.post('/auth/login', data={'username': 'student', 'password': 'secret1'})
+
+    def request():
+        response = client.get('/dashboard')
+        assert response.status_code == 200, response.status_code
+
+    timed('GET /dashboard', request, args.renders)
+
+def timed(label, function, runs):
+    function()
+    started = time.perf_counter()
+    for _ in range(runs):
+        function()
+    print(f'{label:<24} {(time.perf_counter() - started) / runs * 1000:8.2f} ms')
+
+if __name__ == '__main__':
+    main()
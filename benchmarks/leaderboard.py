@@ -0,0 +1,103 @@
+"""
+Leaderboard benchmark: 100k users on the global board
+
+    python benchmarks/leaderboard.py [--users 100000]
+
+Builds a throwaway SQLite database with long-tailed user totals, then
+times the board build, rank, top-K and update operations of ScoreIndex,
+an incremental sync of 1000 changed users, and a SQL COUNT rank for
+comparison. Finally checks that the incrementally synced board matches
+a fresh rebuild.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--users', type=int, default=100000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(directory, 'bench.db')
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from datetime import datetime
+    from sqlalchemy import insert, select, func, text
+    from app import create_app, db
+    from models.user import User
+    from models.activity import DailyUserActivity
+    from services.leaderboard import Leaderboards, ScoreIndex, record_points
+    from services.seeding import migrate
+
+    rng = random.Random(7)
+    app = create_app()
+    app.instance_path = directory
+    with app.app_context():
+        migrate()
+        today = datetime.utcnow().date()
+        db.session.execute(insert(User), [
+            {'username': f'u{i}', 'email': f'u{i}@example.com',
+             'total_score': int(rng.paretovariate(1.2) * 50)}
+            for i in range(args.users)
+        ])
+        db.session.execute(insert(DailyUserActivity), [
+            {'user_id': i + 1, 'day': today, 'points': rng.randrange(0, 500)} for i in range(args.users)
+        ])
+        db.session.commit()
+        print(f'{args.users} users, highest score {db.session.query(func.max(User.total_score)).scalar()}')
+
+        boards = Leaderboards(app)
+        started = time.perf_counter()
+        boards.standings('global', 1)
+        report('cold build (global + weekly)', time.perf_counter() - started, 'ms')
+        board = boards._global
+        print(f'  {len(board._values)} distinct scores, Fenwick tree of {len(board._tree)} slots')
+
+        boards.sync_interval = 3600
+        user_ids = [rng.randrange(1, args.users + 1) for _ in range(10000)]
+        timed('standings (top 10 + own rank)', lambda: [boards.standings('global', u) for u in user_ids], len(user_ids))
+        timed('rank', lambda: [board.rank(u) for u in user_ids], len(user_ids))
+        timed('top 100', lambda: [board.top(100) for _ in range(1000)], 1000)
+
+        copy = ScoreIndex(list(board._scores.items()))
+        held = list(copy._members)
+        timed('set to a score already held', lambda: [copy.set(u, rng.choice(held)) for u in user_ids], len(user_ids))
+        timed('set to a new score (rebuilds)', lambda: [copy.set(u, 10 ** 7 + i) for i, u in enumerate(user_ids[:200])], 200)
+        batch = [(u, copy.score(u) + rng.randrange(1, 30)) for u in user_ids[:1000]]
+        timed('update of 1000 users, one call', lambda: copy.update(batch), 1, 'ms')
+
+        db.session.execute(text('CREATE INDEX ix_bench_total_score ON user (total_score)'))
+        def sql_rank():
+            for u in user_ids[:200]:
+                score = db.session.execute(select(User.total_score).where(User.id == u)).scalar()
+                db.session.execute(select(func.count()).where(User.total_score > score)).scalar()
+        timed('SQL COUNT rank (indexed)', sql_rank, 200)
+
+        boards.sync_interval = 0
+        for start in range(0, 1000, 10):
+            record_points({u: 15 for u in user_ids[start:start + 10]})
+            db.session.commit()
+        timed('sync of 1000 changed users', lambda: boards.standings('global', 1), 1, 'ms')
+        timed('sync with no changes', lambda: boards.standings('global', 1), 1, 'ms')
+
+        fresh = Leaderboards(app)
+        fresh.standings('global', 1)
+        agree = all(fresh._global.rank(u) == board.rank(u) for u in range(1, args.users + 1))
+        print(f'incremental board matches a rebuild: {agree and fresh._global.top(100) == board.top(100)}')
+
+def timed(label, function, count, unit='us'):
+    started = time.perf_counter()
+    function()
+    report(label, (time.perf_counter() - started) / count, unit)
+
+def report(label, seconds, unit='ms'):
+    value = seconds * (1e3 if unit == 'ms' else 1e6)
+    print(f'{label:<36} {value:10.1f} {unit}')
+
+if __name__ == '__main__':
+    main()
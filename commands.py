@@ -0,0 +1,108 @@
+"""
+Flask CLI commands for Math Quest
+
+    flask migrate     create tables and add missing columns/indexes
+    flask seed        seed curriculum content (no-op when unchanged)
+    flask build-pack  compile content into the read-only content pack
+    flask setup       migrate, then seed (and build the pack if it is used)
+    flask backfill    rebuild rollups, totals, mastery and badges from existing history
+    flask calibrate   fit problem difficulty from the attempt log (needs NumPy)
+    flask fold-scores fold pending score deltas into user totals
+    flask prune-leaderboard  delete expired leaderboard change rows
+"""
+
+import click
+from flask import current_app
+
+from app import db
+
+@click.command('migrate')
+def migrate_command():
+    """Create tables and apply additive schema upgrades."""
+    from services.seeding import migrate
+    added = migrate()
+    click.echo(f'Schema up to date ({len(added)} change(s) applied)')
+
+@click.command('seed')
+@click.option('--force', is_flag=True, help='Seed even if the content hash is unchanged.')
+def seed_command(force):
+    """Seed curriculum content if it changed since the last seed."""
+    from services.seeding import seed
+    if seed(force=force):
+        pack = current_app.config.get('CONTENT_SOURCE') == 'pack'
+        click.echo('Curriculum content seeded' + (' and content pack rebuilt' if pack else ''))
+    else:
+        click.echo('Curriculum content unchanged; nothing to do')
+
+@click.command('build-pack')
+def build_pack_command():
+    """Compile curriculum content into the read-only content pack."""
+    from services.content_pack import build_pack
+    from services.content_provider import content_provider
+    stats = build_pack(content_provider.pack_path)
+    click.echo(f"Wrote {stats['concepts']} concept(s) and {stats['problems']} problem(s) "
+               f"({stats['bytes']} bytes) to {content_provider.pack_path}")
+
+@click.command('setup')
+def setup_command():
+    """Migrate the schema, then seed content."""
+    from services.seeding import setup
+    changes, seeded, pack = setup()
+    click.echo(f'Schema up to date ({len(changes)} change(s) applied)')
+    if seeded:
+        pack_used = current_app.config.get('CONTENT_SOURCE') == 'pack'
+        click.echo('Curriculum content seeded' + (' and content pack rebuilt' if pack_used else ''))
+    else:
+        click.echo('Curriculum content unchanged; nothing to do')
+    if pack is not None:
+        from services.content_provider import content_provider
+        click.echo(f"Wrote {pack['concepts']} concept(s) and {pack['problems']} problem(s) "
+                   f"({pack['bytes']} bytes) to {content_provider.pack_path}")
+
+@click.command('backfill')
+def backfill_command():
+    """Rebuild daily activity, score totals, mastery and achievements from existing history."""
+    from models.user import User
+    from services.activity import rebuild_daily_activity
+    from services.achievements import backfill_achievements
+    from services.leaderboard import rebuild_user_totals
+    from services.mastery import rebuild_mastery
+    
+    days = rebuild_daily_activity()
+    rebuild_user_totals()
+    estimates = rebuild_mastery()
+    for user in User.query.all():
+        backfill_achievements(user)
+    db.session.commit()
+    click.echo(f'Rebuilt {days} daily activity row(s), score totals, {estimates} mastery estimate(s) '
+               f'and achievements')
+
+@click.command('calibrate')
+@click.option('--chunk-size', default=100000, show_default=True, help='Attempts read per batch.')
+@click.option('--passes', default=2, show_default=True, help='Passes over the attempt log.')
+def calibrate_command(chunk_size, passes):
+    """Fit problem difficulty from practice attempts."""
+    from services.calibration import calibrate_difficulty
+    try:
+        result = calibrate_difficulty(chunk_size=chunk_size, passes=passes)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Calibrated {result['problems']} problem(s) from {result['attempts']} attempt(s)")
+
+@click.command('fold-scores')
+def fold_scores_command():
+    """Fold pending score deltas into user totals."""
+    from services.score_counters import fold_score_deltas
+    click.echo(f'Folded {fold_score_deltas()} score delta(s)')
+
+@click.command('prune-leaderboard')
+def prune_leaderboard_command():
+    """Delete leaderboard change rows older than the retention period."""
+    from services.leaderboard import prune_changes
+    click.echo(f'Deleted {prune_changes()} leaderboard change row(s)')
+
+def register_commands(app):
+    """Attach the CLI commands to the app"""
+    for command in (migrate_command, seed_command, build_pack_command, setup_command, backfill_command,
+                    calibrate_command, fold_scores_command, prune_leaderboard_command):
+        app.cli.add_command(command)
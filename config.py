@@ -21,6 +21,36 @@ class Config:
     
     # Logging
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    
+    # Seconds between checks of the curriculum content version
+    CONTENT_VERSION_TTL = int(os.environ.get('CONTENT_VERSION_TTL', 5))
+    
+    # Where lesson and problem reads come from: 'database' or 'pack'
+    CONTENT_SOURCE = os.environ.get('CONTENT_SOURCE', 'database')
+    CONTENT_PACK_PATH = os.environ.get('CONTENT_PACK_PATH')  # defaults to instance/content.pack
+    
+    # Problems per quiz and per practice page, drawn at random from the bank
+    QUIZ_SIZE = int(os.environ.get('QUIZ_SIZE', 10))
+    PRACTICE_SET_SIZE = int(os.environ.get('PRACTICE_SET_SIZE', 20))
+    
+    # Cache-Control max-age for cached guest pages (browsers, then CDNs)
+    GUEST_PAGE_MAX_AGE = int(os.environ.get('GUEST_PAGE_MAX_AGE', 60))
+    GUEST_PAGE_SHARED_MAX_AGE = int(os.environ.get('GUEST_PAGE_SHARED_MAX_AGE', 300))
+    
+    # Seconds between leaderboard syncs, and how long the change log is kept
+    LEADERBOARD_SYNC_INTERVAL = float(os.environ.get('LEADERBOARD_SYNC_INTERVAL', 5))
+    LEADERBOARD_CHANGE_RETENTION = int(os.environ.get('LEADERBOARD_CHANGE_RETENTION', 86400))
+    LEADERBOARD_SIZE = int(os.environ.get('LEADERBOARD_SIZE', 10))
+    
+    # Seconds between folds of pending score deltas into user rows, per process
+    SCORE_FOLD_INTERVAL = float(os.environ.get('SCORE_FOLD_INTERVAL', 60))
+    
+    # Write-behind buffering of practice attempts
+    ATTEMPT_WRITE_BEHIND = os.environ.get('ATTEMPT_WRITE_BEHIND', 'False').lower() == 'true'
+    ATTEMPT_BUFFER_SIZE = int(os.environ.get('ATTEMPT_BUFFER_SIZE', 100))
+    ATTEMPT_FLUSH_INTERVAL = float(os.environ.get('ATTEMPT_FLUSH_INTERVAL', 2.0))
+    ATTEMPT_QUEUE_MAX = int(os.environ.get('ATTEMPT_QUEUE_MAX', 10000))
+    ATTEMPT_ENQUEUE_TIMEOUT = float(os.environ.get('ATTEMPT_ENQUEUE_TIMEOUT', 1.0))
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -40,6 +70,8 @@ class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    CONTENT_VERSION_TTL = 0
+    ATTEMPT_WRITE_BEHIND = False
 
 # Configuration dictionary
 config = {
@@ -0,0 +1,21 @@
+"""
+Gunicorn settings for Math Quest
+
+Gunicorn reads this file from the working directory. The master migrates
+the schema and seeds content (``flask setup``) once before forking, so a
+deploy starts a single interpreter and each worker inherits the modules
+the master already imported.
+"""
+
+def on_starting(server):
+    from app import create_app, db
+    from services.seeding import setup
+
+    app = create_app()
+    with app.app_context():
+        changes, seeded, pack = setup()
+        db.session.remove()
+        # Workers open their own connections; none may be shared across the fork
+        db.engine.dispose()
+    server.log.info('Schema up to date (%d change(s) applied); content %s%s', len(changes),
+                    'seeded' if seeded else 'unchanged', '; content pack built' if pack else '')
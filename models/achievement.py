@@ -0,0 +1,18 @@
+from flask_sqlalchemy import SQLAlchemy
+from datetime import datetime
+
+# Import db from app
+from app import db
+
+class UserAchievement(db.Model):
+    """Badge earned by a user, stored when it is first earned"""
+    __tablename__ = 'user_achievement'
+    __table_args__ = (db.UniqueConstraint('user_id', 'code', name='uq_user_achievement_user_code'),)
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    code = db.Column(db.String(50), nullable=False)  # Key into services.achievements.ACHIEVEMENTS
+    earned_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<UserAchievement {self.user_id}:{self.code}>'
@@ -0,0 +1,31 @@
+from flask_sqlalchemy import SQLAlchemy
+
+# Import db from app
+from app import db
+
+class DailyUserActivity(db.Model):
+    """Per-user, per-day rollup of practice activity"""
+    __tablename__ = 'daily_user_activity'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'day', name='uq_daily_user_activity_user_day'),
+        # Weekly leaderboard rebuilds read one week of rows for all users
+        db.Index('ix_daily_user_activity_day', 'day'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    day = db.Column(db.Date, nullable=False)  # UTC date
+    
+    # Rolled-up counters
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    correct = db.Column(db.Integer, nullable=False, default=0)
+    points = db.Column(db.Integer, nullable=False, default=0)
+    time_spent = db.Column(db.Integer, nullable=False, default=0)  # in seconds
+    concepts_completed = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<DailyUserActivity {self.user_id}:{self.day}>'
+    
+    def get_accuracy(self):
+        """Get accuracy as percentage"""
+        return (self.correct / self.attempts * 100) if self.attempts else 0
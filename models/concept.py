@@ -20,6 +20,7 @@ class Concept(db.Model):
     prerequisites = db.Column(db.String(200))  # Comma-separated concept slugs
     
     # Metadata
+    content_hash = db.Column(db.String(64))  # Hash of the content file last loaded
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -39,10 +40,10 @@ class Concept(db.Model):
     def is_available_for_user(self, user_progress):
         """Check if concept is available based on user's completed concepts.
 
-        Accepts a set of completed concept identifiers which may be either
-        slugs (strings) or ids (integers). Prerequisites are defined as slugs,
-        so if the provided set contains ids, we resolve prerequisite slugs to
-        their corresponding ids before checking availability.
+        Accepts a user's CompletionBitmap or a set of completed concept
+        identifiers which may be either slugs (strings) or ids (integers).
+        Prerequisites are defined as slugs, so for ids we resolve prerequisite
+        slugs to their corresponding ids through the cached curriculum graph.
         """
         prereq_slugs = self.get_prerequisites_list()
         if not prereq_slugs:
@@ -51,13 +52,13 @@ class Concept(db.Model):
         if not user_progress:
             return False
 
-        # Detect whether user_progress contains ids (ints) or slugs (str)
-        sample_item = next(iter(user_progress))
-        if isinstance(sample_item, int):
-            # user_progress is a set of ids; resolve prereq slugs to ids
-            prereq_concepts = Concept.query.filter(Concept.slug.in_(prereq_slugs)).all()
-            prereq_ids = {c.id for c in prereq_concepts}
-            return prereq_ids.issubset(user_progress)
+        # Detect whether user_progress contains ids (bitmap or ints) or slugs (str)
+        from models.user import CompletionBitmap
+        if isinstance(user_progress, CompletionBitmap) or isinstance(next(iter(user_progress)), int):
+            # Resolve prereq slugs to ids through the cached curriculum graph
+            from services.curriculum import get_curriculum_graph
+            prereq_ids = get_curriculum_graph().resolve_slugs(prereq_slugs)
+            return all(prereq_id in user_progress for prereq_id in prereq_ids)
         else:
             # user_progress is expected to be a set of slugs
             return set(prereq_slugs).issubset(user_progress)
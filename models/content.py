@@ -0,0 +1,15 @@
+from flask_sqlalchemy import SQLAlchemy
+from datetime import datetime
+
+# Import db from app
+from app import db
+
+class ContentVersion(db.Model):
+    """Single-row counter bumped whenever curriculum content changes"""
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    content_hash = db.Column(db.String(64))  # Hash of the last seeded content
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ContentVersion {self.version}>'
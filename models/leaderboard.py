@@ -0,0 +1,21 @@
+from flask_sqlalchemy import SQLAlchemy
+from datetime import datetime
+
+# Import db from app
+from app import db
+
+class LeaderboardChange(db.Model):
+    """A user whose leaderboard score changed; read by each process to update its boards"""
+    __tablename__ = 'leaderboard_change'
+    __table_args__ = (
+        # Old rows are pruned by age
+        db.Index('ix_leaderboard_change_created_at', 'created_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    concept_id = db.Column(db.Integer, db.ForeignKey('concept.id'))  # NULL: total and weekly points changed
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<LeaderboardChange {self.user_id}:{self.concept_id}>'
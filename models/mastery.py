@@ -0,0 +1,29 @@
+from flask_sqlalchemy import SQLAlchemy
+from datetime import datetime
+
+# Import db from app
+from app import db
+
+class ConceptMastery(db.Model):
+    """Bayesian knowledge tracing estimate of one user's mastery of one concept"""
+    __tablename__ = 'concept_mastery'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'concept_id', name='uq_concept_mastery_user_concept'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    concept_id = db.Column(db.Integer, db.ForeignKey('concept.id'), nullable=False)
+    
+    # See services/mastery.py
+    mastery = db.Column(db.Float, nullable=False)  # Probability the concept is mastered
+    attempts = db.Column(db.Integer, nullable=False, default=0)  # Graded answers included in the estimate
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ConceptMastery {self.user_id}:{self.concept_id} {self.mastery:.2f}>'
+    
+    def is_mastered(self):
+        """Whether the estimate has reached the mastery threshold"""
+        from services.mastery import MASTERY_THRESHOLD
+        return self.mastery >= MASTERY_THRESHOLD
@@ -5,8 +5,27 @@ import json
 # Import db from app
 from app import db
 
+def normalize_answer(answer):
+    """Normalize an answer for comparison"""
+    return str(answer).strip().lower()
+
+def score_attempt(is_correct, time_taken, points):
+    """Calculate an attempt's score from correctness, time and problem points"""
+    if not is_correct:
+        return 0
+    # Bonus for speed (if completed in less than 60 seconds)
+    if time_taken < 60:
+        time_bonus = int((60 - time_taken) / 10)
+        return min(100, points + time_bonus)
+    return points
+
 class PracticeProblem(db.Model):
     """Model representing practice problems for concepts"""
+    __table_args__ = (
+        db.Index('ix_practice_problem_concept_id', 'concept_id'),
+        db.Index('uq_practice_problem_content_key', 'content_key', unique=True),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     concept_id = db.Column(db.Integer, db.ForeignKey('concept.id'), nullable=False)
     
@@ -21,10 +40,15 @@ class PracticeProblem(db.Model):
     explanation = db.Column(db.Text)
     
     # Metadata
+    content_key = db.Column(db.String(100))  # Stable key from the content files
     points = db.Column(db.Integer, default=10)
     time_limit = db.Column(db.Integer, default=120)  # seconds
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Difficulty fitted from attempts by `flask calibrate` (logit scale, higher is harder)
+    calibrated_difficulty = db.Column(db.Float)
+    calibration_attempts = db.Column(db.Integer)
+    
     # Relationships
     attempts = db.relationship('PracticeAttempt', backref='problem', lazy=True)
     
@@ -39,10 +63,16 @@ class PracticeProblem(db.Model):
     
     def check_answer(self, user_answer):
         """Check if user answer is correct"""
-        return str(user_answer).strip().lower() == str(self.correct_answer).strip().lower()
+        return normalize_answer(user_answer) == normalize_answer(self.correct_answer)
 
 class PracticeAttempt(db.Model):
     """Model tracking user attempts at practice problems"""
+    __table_args__ = (
+        # History and recent activity order by completed_at; is_correct makes
+        # the stats COUNT/SUM an index-only scan
+        db.Index('ix_practice_attempt_user_completed', 'user_id', 'completed_at', 'is_correct'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     problem_id = db.Column(db.Integer, db.ForeignKey('practice_problem.id'), nullable=False)
@@ -60,16 +90,12 @@ class PracticeAttempt(db.Model):
     def __repr__(self):
         return f'<PracticeAttempt {self.user_id}:{self.problem_id}>'
     
-    def calculate_score(self):
-        """Calculate score based on correctness and time"""
-        if self.is_correct:
-            base_score = self.problem.points
-            # Bonus for speed (if completed in less than 60 seconds)
-            if self.time_taken < 60:
-                time_bonus = int((60 - self.time_taken) / 10)
-                self.score = min(100, base_score + time_bonus)
-            else:
-                self.score = base_score
-        else:
-            self.score = 0
+    def calculate_score(self, problem=None):
+        """Calculate score based on correctness and time
+        
+        Pass the problem when it is already loaded; the relationship is not
+        populated on attempts that have not been flushed yet.
+        """
+        problem = problem or self.problem
+        self.score = score_attempt(self.is_correct, self.time_taken or 0, problem.points)
         return self.score
@@ -6,6 +6,13 @@ from app import db
 
 class ProgressRecord(db.Model):
     """Model tracking user progress through concepts"""
+    __table_args__ = (
+        # One record per user and concept; also serves filter_by(user_id=...)
+        db.Index('uq_progress_record_user_concept', 'user_id', 'concept_id', unique=True),
+        # Progress chart: a user's records ordered by last attempt
+        db.Index('ix_progress_record_user_last_attempt', 'user_id', 'last_attempt'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     concept_id = db.Column(db.Integer, db.ForeignKey('concept.id'), nullable=False)
@@ -24,17 +31,6 @@ class ProgressRecord(db.Model):
     def __repr__(self):
         return f'<ProgressRecord {self.user_id}:{self.concept_id}>'
     
-    def update_progress(self, new_score, time_spent_seconds):
-        """Update progress with new attempt"""
-        self.attempts += 1
-        self.score = max(self.score, new_score)  # Keep best score
-        self.time_spent += time_spent_seconds
-        self.last_attempt = datetime.utcnow()
-        
-        if new_score >= 80 and not self.completed:
-            self.completed = True
-            self.completed_at = datetime.utcnow()
-    
     def get_progress_percentage(self):
         """Get progress as percentage"""
         return min(100, self.score)
@@ -0,0 +1,29 @@
+from flask_sqlalchemy import SQLAlchemy
+from datetime import datetime
+
+# Import db from app
+from app import db
+
+class ReviewItem(db.Model):
+    """Spaced-repetition schedule of one practice problem for one user"""
+    __tablename__ = 'review_item'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'problem_id', name='uq_review_item_user_problem'),
+        # "Next N due reviews" is a range scan on this index
+        db.Index('ix_review_item_user_due', 'user_id', 'due_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    problem_id = db.Column(db.Integer, db.ForeignKey('practice_problem.id'), nullable=False)
+    
+    # SM-2 scheduling state
+    due_at = db.Column(db.DateTime, nullable=False)
+    interval_days = db.Column(db.Float, nullable=False, default=0)
+    ease = db.Column(db.Float, nullable=False, default=2.5)
+    repetitions = db.Column(db.Integer, nullable=False, default=0)  # Correct answers in a row
+    lapses = db.Column(db.Integer, nullable=False, default=0)
+    last_reviewed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ReviewItem {self.user_id}:{self.problem_id} due {self.due_at}>'
@@ -0,0 +1,22 @@
+from flask_sqlalchemy import SQLAlchemy
+from datetime import datetime
+
+# Import db from app
+from app import db
+
+class ScoreDelta(db.Model):
+    """Pending change to a user's score counters, folded into the user row later"""
+    __tablename__ = 'score_delta'
+    __table_args__ = (
+        # Reads add up a user's pending deltas
+        db.Index('ix_score_delta_user_id', 'user_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    points = db.Column(db.Integer, nullable=False, default=0)
+    concepts_completed = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ScoreDelta {self.user_id}: {self.points:+d} points>'
@@ -6,6 +6,49 @@ from datetime import datetime
 # Import db from app
 from app import db
 
+class CompletionBitmap:
+    """Set of completed concept ids packed into the bits of an integer"""
+    
+    __slots__ = ('mask',)
+    
+    def __init__(self, mask=0):
+        self.mask = mask
+    
+    @classmethod
+    def from_ids(cls, concept_ids):
+        mask = 0
+        for concept_id in concept_ids:
+            mask |= 1 << concept_id
+        return cls(mask)
+    
+    @classmethod
+    def from_bytes(cls, data):
+        return cls(int.from_bytes(data, 'little') if data else 0)
+    
+    def to_bytes(self):
+        return self.mask.to_bytes((self.mask.bit_length() + 7) // 8, 'little')
+    
+    def __contains__(self, concept_id):
+        return concept_id >= 0 and (self.mask >> concept_id) & 1 == 1
+    
+    def __iter__(self):
+        mask, concept_id = self.mask, 0
+        while mask:
+            if mask & 1:
+                yield concept_id
+            mask >>= 1
+            concept_id += 1
+    
+    def __len__(self):
+        return bin(self.mask).count('1')
+    
+    def __bool__(self):
+        return self.mask != 0
+    
+    def issuperset_mask(self, mask):
+        """Check that every bit of ``mask`` is set"""
+        return mask & ~self.mask == 0
+
 class User(UserMixin, db.Model):
     """User model for authentication and progress tracking"""
     id = db.Column(db.Integer, primary_key=True)
@@ -19,6 +62,8 @@ class User(UserMixin, db.Model):
     current_concept = db.Column(db.String(100), default='number_systems')
     total_score = db.Column(db.Integer, default=0)
     concepts_completed = db.Column(db.Integer, default=0)
+    progress_version = db.Column(db.Integer, default=0)  # Bumped on every progress record change
+    completion_bitmap = db.Column(db.LargeBinary, default=b'')  # Completed concept ids as bits; NULL until backfilled
     
     # Relationships
     progress_records = db.relationship('ProgressRecord', backref='user', lazy=True)
@@ -30,12 +75,41 @@ class User(UserMixin, db.Model):
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
     
-    def update_progress(self, concept, score):
-        """Update user progress for a specific concept"""
-        self.current_concept = concept
-        self.total_score += score
-        if score >= 80:  # 80% threshold for concept completion
-            self.concepts_completed += 1
+    def get_completed_concepts(self):
+        """Completed concept ids, read from the bitmap on the user row
+
+        Users created before the bitmap existed get it built once from their
+        progress records.
+        """
+        if self.completion_bitmap is None:
+            self._build_completion_bitmap()
+            db.session.commit()
+        return CompletionBitmap.from_bytes(self.completion_bitmap)
+    
+    def _build_completion_bitmap(self):
+        from models.progress import ProgressRecord
+        rows = db.session.query(ProgressRecord.concept_id).filter_by(
+            user_id=self.id, completed=True
+        ).all()
+        self.completion_bitmap = CompletionBitmap.from_ids(r.concept_id for r in rows).to_bytes()
+    
+    def set_concept_completed(self, concept_id, completed=True):
+        """Set or clear a concept's bit in the completion bitmap
+
+        The user row may have been loaded at the start of the request, so the
+        bitmap is re-read under a row lock first; otherwise a concurrent
+        completion's bit would be overwritten.
+        """
+        db.session.flush()
+        db.session.refresh(self, attribute_names=['completion_bitmap'], with_for_update=True)
+        if self.completion_bitmap is None:
+            self._build_completion_bitmap()
+        bitmap = CompletionBitmap.from_bytes(self.completion_bitmap)
+        if completed:
+            bitmap.mask |= 1 << concept_id
+        else:
+            bitmap.mask &= ~(1 << concept_id)
+        self.completion_bitmap = bitmap.to_bytes()
     
     def __repr__(self):
         return f'<User {self.username}>'
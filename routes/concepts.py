@@ -1,8 +1,9 @@
-from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for
+from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for, abort, current_app
 from flask_login import login_required, current_user
-from models.concept import Concept
 from models.progress import ProgressRecord
-from models.practice import PracticeProblem
+from services.curriculum import get_concept_by_slug
+from services.content_provider import content_provider
+from services.progress import record_progress_attempt, record_concept_completion
 from app import db, csrf
 
 concepts_bp = Blueprint('concepts', __name__)
@@ -11,11 +12,10 @@ concepts_bp = Blueprint('concepts', __name__)
 @login_required
 def concept_list():
     """List all available concepts"""
-    concepts = Concept.query.order_by(Concept.order_in_curriculum).all()
+    concepts = content_provider.concepts()
     
     # Get user's progress
-    progress_records = ProgressRecord.query.filter_by(user_id=current_user.id).all()
-    completed_concepts = {pr.concept_id for pr in progress_records if pr.completed}
+    completed_concepts = current_user.get_completed_concepts()
     
     return render_template('concepts/list.html',
                          concepts=concepts,
@@ -25,11 +25,12 @@ def concept_list():
 @login_required
 def concept_detail(slug):
     """Show concept lesson and details"""
-    concept = Concept.query.filter_by(slug=slug).first_or_404()
+    concept = content_provider.concept_by_slug(slug)
+    if concept is None:
+        abort(404)
     
     # Check if user can access this concept
-    progress_records = ProgressRecord.query.filter_by(user_id=current_user.id).all()
-    completed_concepts = {pr.concept_id for pr in progress_records if pr.completed}
+    completed_concepts = current_user.get_completed_concepts()
     
     if not concept.is_available_for_user(completed_concepts):
         flash('You need to complete prerequisite concepts first!', 'warning')
@@ -42,7 +43,7 @@ def concept_detail(slug):
     ).first()
     
     # Get practice problems for this concept
-    practice_problems = PracticeProblem.query.filter_by(concept_id=concept.id).limit(5).all()
+    practice_problems = content_provider.problems(concept.id, limit=5)
     
     return render_template('concepts/detail.html',
                          concept=concept,
@@ -53,10 +54,12 @@ def concept_detail(slug):
 @login_required
 def concept_practice(slug):
     """Practice problems for a specific concept"""
-    concept = Concept.query.filter_by(slug=slug).first_or_404()
+    concept = content_provider.concept_by_slug(slug)
+    if concept is None:
+        abort(404)
     
-    # Get practice problems
-    problems = PracticeProblem.query.filter_by(concept_id=concept.id).all()
+    # Get a random set of practice problems
+    problems = content_provider.draw_problems(concept.id, current_app.config.get('PRACTICE_SET_SIZE', 20))
     
     if not problems:
         flash('No practice problems available for this concept yet.', 'info')
@@ -71,26 +74,11 @@ def concept_practice(slug):
 @csrf.exempt
 def mark_concept_complete(slug):
     """Mark a concept as completed"""
-    concept = Concept.query.filter_by(slug=slug).first_or_404()
-    
-    # Get or create progress record
-    progress = ProgressRecord.query.filter_by(
-        user_id=current_user.id,
-        concept_id=concept.id
-    ).first()
-    
-    if not progress:
-        progress = ProgressRecord(
-            user_id=current_user.id,
-            concept_id=concept.id,
-            score=100,
-            completed=True
-        )
-        db.session.add(progress)
-    else:
-        progress.score = 100
-        progress.completed = True
+    concept = get_concept_by_slug(slug)
+    if concept is None:
+        abort(404)
     
+    record_concept_completion(current_user, concept.id)
     db.session.commit()
     
     flash(f'Congratulations! You completed "{concept.name}"!', 'success')
@@ -101,26 +89,15 @@ def mark_concept_complete(slug):
 @csrf.exempt
 def update_progress(slug):
     """Update user progress for a concept"""
-    concept = Concept.query.filter_by(slug=slug).first_or_404()
+    concept = get_concept_by_slug(slug)
+    if concept is None:
+        abort(404)
     
     data = request.get_json()
     score = data.get('score', 0)
     time_spent = data.get('time_spent', 0)
     
-    # Get or create progress record
-    progress = ProgressRecord.query.filter_by(
-        user_id=current_user.id,
-        concept_id=concept.id
-    ).first()
-    
-    if not progress:
-        progress = ProgressRecord(
-            user_id=current_user.id,
-            concept_id=concept.id
-        )
-        db.session.add(progress)
-    
-    progress.update_progress(score, time_spent)
+    progress = record_progress_attempt(current_user, concept.id, score, time_spent)
     db.session.commit()
     
     return jsonify({
@@ -1,39 +1,48 @@
-from flask import Blueprint, render_template, request, jsonify
-from models.concept import Concept
-from models.practice import PracticeProblem
+from flask import Blueprint, render_template, request, jsonify, abort
+from services.content_provider import content_provider
+from services.answer_key import get_answer_key
+from services.page_cache import cache_guest_page
 from app import db, csrf
 
 guest_bp = Blueprint('guest', __name__)
 
 @guest_bp.route('/')
+@cache_guest_page
 def guest_home():
     """Guest home page with concept overview"""
-    concepts = Concept.query.order_by(Concept.order_in_curriculum).all()
+    concepts = content_provider.concepts()
     return render_template('guest/home.html', concepts=concepts)
 
 @guest_bp.route('/concepts')
+@cache_guest_page
 def guest_concepts():
     """List all concepts for guests"""
-    concepts = Concept.query.order_by(Concept.order_in_curriculum).all()
+    concepts = content_provider.concepts()
     return render_template('guest/concepts.html', concepts=concepts)
 
 @guest_bp.route('/concept/<slug>')
+@cache_guest_page
 def guest_concept_detail(slug):
     """Show concept lesson for guests"""
-    concept = Concept.query.filter_by(slug=slug).first_or_404()
+    concept = content_provider.concept_by_slug(slug)
+    if concept is None:
+        abort(404)
     
     # Get practice problems for this concept
-    practice_problems = PracticeProblem.query.filter_by(concept_id=concept.id).limit(3).all()
+    practice_problems = content_provider.problems(concept.id, limit=3)
     
     return render_template('guest/concept_detail.html',
                          concept=concept,
                          practice_problems=practice_problems)
 
 @guest_bp.route('/practice/<int:concept_id>')
+@cache_guest_page
 def guest_practice(concept_id):
     """Practice problems for guests"""
-    concept = Concept.query.get_or_404(concept_id)
-    problems = PracticeProblem.query.filter_by(concept_id=concept_id).limit(5).all()
+    concept = content_provider.concept(concept_id)
+    if concept is None:
+        abort(404)
+    problems = content_provider.problems(concept_id, limit=5)
     
     if not problems:
         return render_template('guest/no_practice.html', concept=concept)
@@ -46,22 +55,25 @@ def guest_practice(concept_id):
 @csrf.exempt
 def guest_submit_answer(problem_id):
     """Submit answer for guest practice (no scoring)"""
-    problem = PracticeProblem.query.get_or_404(problem_id)
+    problem = get_answer_key(problem_id)
+    if problem is None:
+        abort(404)
     
     data = request.get_json()
     user_answer = data.get('answer', '')
     
     # Check if answer is correct
-    is_correct = problem.check_answer(user_answer)
+    is_correct = problem.check(user_answer)
     
     return jsonify({
         'success': True,
         'correct': is_correct,
-        'explanation': problem.explanation if problem.explanation else None,
+        'explanation': problem.explanation,
         'message': 'Great job! This is how guest mode works. Create an account to track your progress!'
     })
 
 @guest_bp.route('/demo')
+@cache_guest_page
 def guest_demo():
     """Demo page showing what the full app offers"""
     return render_template('guest/demo.html')
@@ -1,8 +1,9 @@
 from flask import Blueprint, render_template, redirect, url_for
 from flask_login import login_required, current_user
 from models.user import User
-from models.concept import Concept
 from models.progress import ProgressRecord
+from services.curriculum import get_curriculum_graph, get_ordered_concepts
+from services.score_counters import get_score_totals
 from app import db
 
 main_bp = Blueprint('main', __name__)
@@ -18,30 +19,58 @@ def dashboard():
     """User dashboard showing progress and available concepts"""
     # Get user's progress
     progress_records = ProgressRecord.query.filter_by(user_id=current_user.id).all()
-    completed_concepts = {pr.concept_id for pr in progress_records if pr.completed}
+    completed_concepts = current_user.get_completed_concepts()
     
     # Get all concepts ordered by curriculum
-    concepts = Concept.query.order_by(Concept.order_in_curriculum).all()
+    concepts = get_ordered_concepts()
     
     # Calculate overall progress
     total_concepts = len(concepts)
     completed_count = len(completed_concepts)
     progress_percentage = (completed_count / total_concepts * 100) if total_concepts > 0 else 0
     
-    # Get next available concept
-    next_concept = None
-    for concept in concepts:
-        if concept.id not in completed_concepts and concept.is_available_for_user(completed_concepts):
-            next_concept = concept
-            break
+    # Get next available concept from the cached prerequisite graph
+    graph = get_curriculum_graph()
+    next_concept_id = graph.next_concept_id(completed_concepts)
+    next_concept = next((c for c in concepts if c.id == next_concept_id), None)
+    
+    learning_path = build_learning_path(concepts, progress_records, completed_concepts, graph)
+    total_score, _ = get_score_totals([current_user.id]).get(current_user.id, (0, 0))
     
     return render_template('dashboard.html',
                          concepts=concepts,
-                         progress_records=progress_records,
+                         total_score=total_score,
+                         learning_path=learning_path,
                          completed_concepts=completed_concepts,
                          progress_percentage=progress_percentage,
                          next_concept=next_concept)
 
+def build_learning_path(concepts, progress_records, completed_concepts, graph):
+    """Build the per-concept card data for the dashboard in one linear pass"""
+    progress_by_concept = {pr.concept_id: pr for pr in progress_records}
+    
+    learning_path = []
+    for concept in concepts:
+        progress = progress_by_concept.get(concept.id)
+        is_completed = concept.id in completed_concepts
+        is_available = is_completed or graph.is_available(concept.id, completed_concepts)
+        
+        if is_completed:
+            status = 'completed'
+        elif is_available:
+            status = 'available'
+        else:
+            status = 'locked'
+        
+        learning_path.append({
+            'concept': concept,
+            'status': status,
+            'available': is_available,
+            'best_score': progress.score if progress else None,
+            'attempts': progress.attempts if progress else 0,
+        })
+    return learning_path
+
 @main_bp.route('/about')
 def about():
     """About page explaining the math game"""
@@ -50,5 +79,5 @@ def about():
 @main_bp.route('/curriculum')
 def curriculum():
     """Curriculum overview page"""
-    concepts = Concept.query.order_by(Concept.order_in_curriculum).all()
+    concepts = get_ordered_concepts()
     return render_template('curriculum.html', concepts=concepts)
@@ -1,10 +1,15 @@
-from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for
+from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for, abort, current_app
 from flask_login import login_required, current_user
-from models.practice import PracticeProblem, PracticeAttempt
-from models.concept import Concept
+from models.practice import PracticeAttempt, score_attempt
+from services.curriculum import get_curriculum_graph
+from services.content_provider import content_provider
+from services.attempt_buffer import attempt_buffer
+from services.answer_key import get_answer_key
+from services.review import due_reviews, count_due_reviews
 from app import db, csrf
 from datetime import datetime
 import json
+import math
 
 practice_bp = Blueprint('practice', __name__)
 
@@ -12,15 +17,26 @@ practice_bp = Blueprint('practice', __name__)
 @login_required
 def practice_home():
     """Practice home page with concept selection"""
-    concepts = Concept.query.order_by(Concept.order_in_curriculum).all()
-    return render_template('practice/home.html', concepts=concepts)
+    concepts = content_provider.concepts()
+    return render_template('practice/home.html', concepts=concepts,
+                           due_reviews=count_due_reviews(current_user.id))
+
+@practice_bp.route('/review')
+@login_required
+def review():
+    """Spaced-repetition review of the user's due problems"""
+    problems = [problem for problem in map(content_provider.problem, due_reviews(current_user.id))
+                if problem is not None]
+    return render_template('practice/review.html', problems=problems)
 
 @practice_bp.route('/concept/<int:concept_id>')
 @login_required
 def practice_concept(concept_id):
     """Practice problems for a specific concept"""
-    concept = Concept.query.get_or_404(concept_id)
-    problems = PracticeProblem.query.filter_by(concept_id=concept_id).all()
+    concept = content_provider.concept(concept_id)
+    if concept is None:
+        abort(404)
+    problems = content_provider.draw_problems(concept_id, current_app.config.get('PRACTICE_SET_SIZE', 20))
     
     if not problems:
         flash('No practice problems available for this concept.', 'info')
@@ -34,8 +50,10 @@ def practice_concept(concept_id):
 @login_required
 def practice_problem(problem_id):
     """Individual practice problem"""
-    problem = PracticeProblem.query.get_or_404(problem_id)
-    concept = Concept.query.get(problem.concept_id)
+    problem = content_provider.problem(problem_id)
+    if problem is None:
+        abort(404)
+    concept = content_provider.concept(problem.concept_id)
     
     return render_template('practice/problem.html',
                          problem=problem,
@@ -45,44 +63,63 @@ def practice_problem(problem_id):
 @login_required
 @csrf.exempt
 def submit_answer(problem_id):
-    """Submit answer for a practice problem"""
-    problem = PracticeProblem.query.get_or_404(problem_id)
+    """Submit answer for a practice problem
+    
+    ``mastery`` in the response is None while the attempt is queued for
+    the write-behind buffer.
+    """
+    problem = get_answer_key(problem_id)
+    if problem is None:
+        abort(404)
     
     data = request.get_json()
     user_answer = data.get('answer', '')
     time_taken = data.get('time_taken', 0)
     
     # Check if answer is correct
-    is_correct = problem.check_answer(user_answer)
-    
-    # Create attempt record
-    attempt = PracticeAttempt(
-        user_id=current_user.id,
-        problem_id=problem_id,
-        user_answer=user_answer,
-        is_correct=is_correct,
-        time_taken=time_taken
-    )
+    is_correct = problem.check(user_answer)
     
     # Calculate score
-    score = attempt.calculate_score()
-    
-    db.session.add(attempt)
+    score = score_attempt(is_correct, time_taken, problem.points)
+    
+    # Record attempt, with its mastery and review updates (queued when write-behind is enabled)
+    now = datetime.utcnow()
+    mastery = attempt_buffer.add([{
+        'user_id': current_user.id,
+        'problem_id': problem_id,
+        'user_answer': user_answer,
+        'is_correct': is_correct,
+        'time_taken': time_taken,
+        'score': score,
+        'started_at': now,
+        'completed_at': now
+    }]).get((current_user.id, problem.concept_id))
     db.session.commit()
     
     return jsonify({
         'success': True,
         'correct': is_correct,
         'score': score,
-        'explanation': problem.explanation if problem.explanation else None
+        'explanation': problem.explanation,
+        'mastery': round(mastery, 3) if mastery is not None else None
     })
 
 @practice_bp.route('/quiz/<int:concept_id>')
 @login_required
 def concept_quiz(concept_id):
-    """Quiz mode for a concept with multiple problems"""
-    concept = Concept.query.get_or_404(concept_id)
-    problems = PracticeProblem.query.filter_by(concept_id=concept_id).limit(10).all()
+    """Quiz mode for a concept with multiple problems
+
+    Problems are drawn at random. An optional ``mix`` parameter such as
+    ``?mix=1:3,2:5,3:2`` weights the draw by difficulty.
+    """
+    concept = content_provider.concept(concept_id)
+    if concept is None:
+        abort(404)
+    try:
+        mix = _parse_mix(request.args.get('mix'))
+    except ValueError:
+        abort(400)
+    problems = content_provider.draw_problems(concept_id, current_app.config.get('QUIZ_SIZE', 10), mix)
     
     if not problems:
         flash('No problems available for quiz mode.', 'info')
@@ -96,41 +133,59 @@ def concept_quiz(concept_id):
 @login_required
 @csrf.exempt
 def submit_quiz():
-    """Submit quiz answers and calculate final score"""
+    """Submit quiz answers and calculate final score
+    
+    Answers are graded in memory against the cached answer key and all
+    attempts are written with one multi-row insert (or queued for the
+    write-behind buffer), so the number of database round trips does not
+    grow with the number of questions.
+    """
     data = request.get_json()
-    concept_id = data.get('concept_id')
     answers = data.get('answers', {})
     total_time = data.get('total_time', 0)
     
-    concept = Concept.query.get_or_404(concept_id)
-    problems = PracticeProblem.query.filter_by(concept_id=concept_id).all()
+    try:
+        concept_id = int(data.get('concept_id'))
+    except (TypeError, ValueError):
+        abort(404)
+    if concept_id not in get_curriculum_graph().id_to_slug:
+        abort(404)
+    
+    # Grade against the cached answer key, ignoring problems from other concepts
+    problems = []
+    for pid, user_answer in answers.items():
+        entry = get_answer_key(int(pid)) if str(pid).isdigit() else None
+        if entry is not None and entry.concept_id == concept_id:
+            problems.append((entry, user_answer))
     
     total_score = 0
     correct_answers = 0
-    
-    for problem in problems:
-        if str(problem.id) in answers:
-            user_answer = answers[str(problem.id)]
-            is_correct = problem.check_answer(user_answer)
-            
-            if is_correct:
-                correct_answers += 1
-                total_score += problem.points
-            
-            # Record attempt
-            attempt = PracticeAttempt(
-                user_id=current_user.id,
-                problem_id=problem.id,
-                user_answer=user_answer,
-                is_correct=is_correct,
-                time_taken=total_time // len(problems)  # Approximate time per problem
-            )
-            attempt.calculate_score()
-            db.session.add(attempt)
+    time_per_problem = total_time // len(problems) if problems else 0  # Approximate time per problem
+    now = datetime.utcnow()
+    attempt_rows = []
+    
+    for problem, user_answer in problems:
+        is_correct = problem.check(user_answer)
+        
+        if is_correct:
+            correct_answers += 1
+            total_score += problem.points
+        
+        attempt_rows.append({
+            'user_id': current_user.id,
+            'problem_id': problem.problem_id,
+            'user_answer': user_answer,
+            'is_correct': is_correct,
+            'time_taken': time_per_problem,
+            'score': score_attempt(is_correct, time_per_problem, problem.points),
+            'started_at': now,
+            'completed_at': now
+        })
     
     # Calculate percentage score
     percentage_score = (correct_answers / len(problems)) * 100 if problems else 0
     
+    mastery = attempt_buffer.add(attempt_rows).get((current_user.id, concept_id))
     db.session.commit()
     
     return jsonify({
@@ -138,7 +193,8 @@ def submit_quiz():
         'total_score': total_score,
         'correct_answers': correct_answers,
         'total_problems': len(problems),
-        'percentage': percentage_score
+        'percentage': percentage_score,
+        'mastery': round(mastery, 3) if mastery is not None else None
     })
 
 @practice_bp.route('/history')
@@ -149,3 +205,16 @@ def practice_history():
         .order_by(PracticeAttempt.completed_at.desc()).limit(50).all()
     
     return render_template('practice/history.html', attempts=attempts)
+
+def _parse_mix(value):
+    """Parse ``difficulty:weight`` pairs such as ``1:3,2:5`` into a dict"""
+    if not value:
+        return None
+    mix = {}
+    for pair in value.split(','):
+        difficulty, weight = pair.split(':')
+        weight = float(weight)
+        if not math.isfinite(weight) or weight < 0:
+            raise ValueError(weight)
+        mix[int(difficulty)] = weight
+    return mix
@@ -1,10 +1,19 @@
-from flask import Blueprint, render_template, jsonify, request
+from flask import Blueprint, render_template, jsonify, request, make_response, abort, current_app
 from flask_login import login_required, current_user
+from sqlalchemy import func, case
+from models.user import User
 from models.progress import ProgressRecord
 from models.concept import Concept
 from models.practice import PracticeAttempt, PracticeProblem
+from services.curriculum import get_ordered_concepts
+from services.activity import get_activity_summary
+from services.score_series import get_score_series
+from services.achievements import get_user_achievements
+from services.content import get_content_version
+from services.content_provider import content_provider
+from services.leaderboard import leaderboards, BOARDS
 from app import db
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
 
 progress_bp = Blueprint('progress', __name__)
@@ -14,7 +23,7 @@ progress_bp = Blueprint('progress', __name__)
 def progress_overview():
     """Show overall progress overview"""
     # Get all concepts
-    concepts = Concept.query.order_by(Concept.order_in_curriculum).all()
+    concepts = get_ordered_concepts()
     
     # Get user's progress
     progress_records = ProgressRecord.query.filter_by(user_id=current_user.id).all()
@@ -68,39 +77,29 @@ def concept_progress(concept_id):
 @progress_bp.route('/stats')
 @login_required
 def progress_stats():
-    """Show detailed statistics and analytics"""
-    # Get all progress records
-    progress_records = ProgressRecord.query.filter_by(user_id=current_user.id).all()
-    
-    # Calculate various statistics
-    total_score = sum(pr.score for pr in progress_records)
-    total_time = sum(pr.time_spent for pr in progress_records)
-    total_attempts = sum(pr.attempts for pr in progress_records)
-    
-    # Get practice statistics
-    practice_attempts = PracticeAttempt.query.filter_by(user_id=current_user.id).all()
-    correct_answers = sum(1 for pa in practice_attempts if pa.is_correct)
-    total_practice = len(practice_attempts)
+    """Show detailed statistics and analytics
+    
+    Everything is computed with grouped SQL aggregates, so the cost does not
+    depend on how many attempts the user has made.
+    """
+    # Progress totals
+    totals = db.session.query(
+        func.coalesce(func.sum(ProgressRecord.score), 0),
+        func.coalesce(func.sum(ProgressRecord.time_spent), 0),
+        func.coalesce(func.sum(ProgressRecord.attempts), 0)
+    ).filter(ProgressRecord.user_id == current_user.id).one()
+    total_score, total_time, total_attempts = (int(v) for v in totals)
+    
+    # Practice statistics
+    practice = db.session.query(
+        func.count(PracticeAttempt.id),
+        func.coalesce(func.sum(case((PracticeAttempt.is_correct, 1), else_=0)), 0)
+    ).filter(PracticeAttempt.user_id == current_user.id).one()
+    total_practice, correct_answers = (int(v) for v in practice)
     accuracy = (correct_answers / total_practice * 100) if total_practice > 0 else 0
     
-    # Weekly progress (last 4 weeks)
-    four_weeks_ago = datetime.utcnow() - timedelta(weeks=4)
-    recent_progress = ProgressRecord.query.filter(
-        ProgressRecord.user_id == current_user.id,
-        ProgressRecord.last_attempt >= four_weeks_ago
-    ).all()
-    
-    weekly_data = []
-    for i in range(4):
-        week_start = datetime.utcnow() - timedelta(weeks=i+1)
-        week_end = datetime.utcnow() - timedelta(weeks=i)
-        week_progress = [pr for pr in recent_progress 
-                        if week_start <= pr.last_attempt < week_end]
-        weekly_data.append({
-            'week': f'Week {4-i}',
-            'concepts_attempted': len(week_progress),
-            'average_score': sum(pr.score for pr in week_progress) / len(week_progress) if week_progress else 0
-        })
+    # Weekly, monthly and streak figures from the daily activity rollup
+    activity = get_activity_summary(current_user.id)
     
     return render_template('progress/stats.html',
                          total_score=total_score,
@@ -109,105 +108,77 @@ def progress_stats():
                          accuracy=accuracy,
                          correct_answers=correct_answers,
                          total_practice=total_practice,
-                         weekly_data=weekly_data)
+                         weekly_data=activity['weekly'],
+                         monthly_data=activity['monthly'],
+                         current_streak=activity['current_streak'])
 
 @progress_bp.route('/achievements')
 @login_required
 def achievements():
     """Show user achievements and badges"""
-    # Get user's progress
-    progress_records = ProgressRecord.query.filter_by(user_id=current_user.id).all()
-    completed_concepts = [pr for pr in progress_records if pr.completed]
-    
-    # Define achievements
-    achievements = []
-    
-    # Concept completion achievements
-    if len(completed_concepts) >= 1:
-        achievements.append({
-            'name': 'First Steps',
-            'description': 'Complete your first concept',
-            'icon': '🎯',
-            'earned': True,
-            'date': min(pr.completed_at for pr in completed_concepts)
-        })
-    
-    if len(completed_concepts) >= 5:
-        achievements.append({
-            'name': 'Math Explorer',
-            'description': 'Complete 5 concepts',
-            'icon': '🌟',
-            'earned': True,
-            'date': sorted([pr.completed_at for pr in completed_concepts])[4]
-        })
-    
-    if len(completed_concepts) >= 10:
-        achievements.append({
-            'name': 'Math Master',
-            'description': 'Complete 10 concepts',
-            'icon': '👑',
-            'earned': True,
-            'date': sorted([pr.completed_at for pr in completed_concepts])[9]
-        })
-    
-    # Score achievements
-    total_score = sum(pr.score for pr in progress_records)
-    if total_score >= 100:
-        achievements.append({
-            'name': 'Century Club',
-            'description': 'Earn 100 total points',
-            'icon': '💯',
-            'earned': True,
-            'date': datetime.utcnow()
-        })
-    
-    if total_score >= 500:
-        achievements.append({
-            'name': 'High Achiever',
-            'description': 'Earn 500 total points',
-            'icon': '🏆',
-            'earned': True,
-            'date': datetime.utcnow()
-        })
-    
-    # Add unearned achievements for motivation
-    if len(completed_concepts) < 15:
-        achievements.append({
-            'name': 'Math Champion',
-            'description': 'Complete 15 concepts',
-            'icon': '🏅',
-            'earned': False,
-            'date': None
-        })
-    
-    if total_score < 1000:
-        achievements.append({
-            'name': 'Ultimate Math',
-            'description': 'Earn 1000 total points',
-            'icon': '💎',
-            'earned': False,
-            'date': None
-        })
-    
+    achievements = get_user_achievements(current_user.id)
     return render_template('progress/achievements.html', achievements=achievements)
 
+@progress_bp.route('/leaderboard')
+@login_required
+def leaderboard():
+    """Show the top players and the user's own rank on a leaderboard
+    
+    ``board`` is global (all-time points), weekly (points since Monday) or
+    concept (best score on the concept given by ``concept``).
+    """
+    board = request.args.get('board', 'global')
+    if board not in BOARDS:
+        abort(404)
+    concept = None
+    if board == 'concept':
+        concept = content_provider.concept(request.args.get('concept', type=int))
+        if concept is None:
+            abort(404)
+    
+    standings = leaderboards.standings(board, current_user.id, current_app.config.get('LEADERBOARD_SIZE', 10),
+                                       concept_id=concept.id if concept else None)
+    user_ids = [user_id for _, user_id, _ in standings['top']]
+    names = dict(db.session.query(User.id, User.username).filter(User.id.in_(user_ids)).all()) if user_ids else {}
+    return render_template('progress/leaderboard.html',
+                         board=board,
+                         concept=concept,
+                         concepts=content_provider.concepts(),
+                         standings=standings,
+                         names=names)
+
 @progress_bp.route('/api/chart-data')
 @login_required
 def chart_data():
-    """API endpoint for chart data"""
-    # Get progress over time
-    progress_records = ProgressRecord.query.filter_by(user_id=current_user.id)\
-        .order_by(ProgressRecord.last_attempt).all()
-    
-    chart_data = []
-    cumulative_score = 0
-    
-    for pr in progress_records:
-        cumulative_score += pr.score
-        chart_data.append({
-            'date': pr.last_attempt.strftime('%Y-%m-%d'),
-            'score': cumulative_score,
-            'concept': pr.concept.name
-        })
-    
-    return jsonify(chart_data)
+    """API endpoint for chart data
+    
+    Optional ``start``/``end`` (YYYY-MM-DD) limit the date range and
+    ``bucket`` (day, week or month) keeps the last point of each period.
+    Responses carry an ETag derived from the user's progress version, so
+    unchanged polls are answered with 304 Not Modified.
+    """
+    try:
+        start = _parse_date(request.args.get('start'))
+        end = _parse_date(request.args.get('end'))
+    except ValueError:
+        return jsonify({'error': 'start and end must be YYYY-MM-DD'}), 400
+    bucket = request.args.get('bucket')
+    if bucket not in (None, 'day', 'week', 'month'):
+        return jsonify({'error': 'bucket must be day, week or month'}), 400
+    
+    etag = '{}-{}-{}-{}'.format(current_user.id, current_user.progress_version or 0,
+                                get_content_version(), request.query_string.decode())
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        series = get_score_series(current_user)
+        concept_names = {c.id: c.name for c in get_ordered_concepts()}
+        response = jsonify(series.points(concept_names, start, end, bucket))
+    
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+def _parse_date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date() if value else None
@@ -7,6 +7,13 @@ from app import create_app
 
 if __name__ == '__main__':
     app = create_app()
+    
+    # Create tables and seed content (no-op when already up to date)
+    with app.app_context():
+        from services.seeding import migrate, seed
+        migrate()
+        seed()
+    
     print("🚀 Starting Math Quest...")
     print("📚 8th Grade Math Learning Platform")
     print("🌐 Open your browser to: http://localhost:5001")
@@ -0,0 +1,119 @@
+"""
+Achievement engine for Math Quest
+
+Badges are declared as threshold rules over a metric. Rules are evaluated
+only when a write that can change their metric happens (a concept
+completion or a score change), and newly earned badges are stored in
+``user_achievement`` with the time they were earned. The achievements
+page then renders from a single read of that table.
+"""
+
+from datetime import datetime
+from sqlalchemy import func
+
+from app import db
+from models.achievement import UserAchievement
+from models.progress import ProgressRecord
+from services.upsert import dialect_insert
+
+# Events that can change each metric
+CONCEPT_COMPLETED = 'concept_completed'
+SCORE_CHANGED = 'score_changed'
+
+ACHIEVEMENTS = [
+    {'code': 'first_steps', 'name': 'First Steps', 'description': 'Complete your first concept',
+     'icon': '🎯', 'metric': 'concepts_completed', 'threshold': 1},
+    {'code': 'math_explorer', 'name': 'Math Explorer', 'description': 'Complete 5 concepts',
+     'icon': '🌟', 'metric': 'concepts_completed', 'threshold': 5},
+    {'code': 'math_master', 'name': 'Math Master', 'description': 'Complete 10 concepts',
+     'icon': '👑', 'metric': 'concepts_completed', 'threshold': 10},
+    {'code': 'century_club', 'name': 'Century Club', 'description': 'Earn 100 total points',
+     'icon': '💯', 'metric': 'total_score', 'threshold': 100},
+    {'code': 'high_achiever', 'name': 'High Achiever', 'description': 'Earn 500 total points',
+     'icon': '🏆', 'metric': 'total_score', 'threshold': 500},
+    # Shown while locked, for motivation
+    {'code': 'math_champion', 'name': 'Math Champion', 'description': 'Complete 15 concepts',
+     'icon': '🏅', 'metric': 'concepts_completed', 'threshold': 15, 'show_locked': True},
+    {'code': 'ultimate_math', 'name': 'Ultimate Math', 'description': 'Earn 1000 total points',
+     'icon': '💎', 'metric': 'total_score', 'threshold': 1000, 'show_locked': True},
+]
+
+METRIC_EVENTS = {
+    'concepts_completed': CONCEPT_COMPLETED,
+    'total_score': SCORE_CHANGED,
+}
+
+def _metric_value(metric, user):
+    if metric == 'concepts_completed':
+        return len(user.get_completed_concepts())
+    if metric == 'total_score':
+        return db.session.query(func.coalesce(func.sum(ProgressRecord.score), 0))\
+            .filter(ProgressRecord.user_id == user.id).scalar()
+    raise ValueError(f'Unknown achievement metric: {metric}')
+
+def _award(user_id, codes, earned_at):
+    if not codes:
+        return
+    stmt = dialect_insert(UserAchievement).values(
+        [{'user_id': user_id, 'code': code, 'earned_at': earned_at} for code in codes]
+    ).on_conflict_do_nothing(index_elements=['user_id', 'code'])
+    db.session.execute(stmt)
+
+def handle_events(user, events):
+    """Evaluate the rules affected by the given events and store new badges
+
+    Call inside the transaction that made the change; returns the codes of
+    badges earned by it.
+    """
+    rules = [rule for rule in ACHIEVEMENTS if METRIC_EVENTS[rule['metric']] in events]
+    if not rules:
+        return []
+
+    db.session.flush()
+    earned = {code for (code,) in db.session.query(UserAchievement.code).filter_by(user_id=user.id)}
+    values = {}
+    new_codes = []
+    for rule in rules:
+        if rule['code'] in earned:
+            continue
+        if rule['metric'] not in values:
+            values[rule['metric']] = _metric_value(rule['metric'], user)
+        if values[rule['metric']] >= rule['threshold']:
+            new_codes.append(rule['code'])
+
+    _award(user.id, new_codes, datetime.utcnow())
+    return new_codes
+
+def backfill_achievements(user):
+    """Award badges a user already qualifies for, e.g. history from before the engine
+
+    Concept badges are dated by the matching completion; score badges,
+    whose history is not recorded, are dated now.
+    """
+    completed_at = sorted(
+        at for (at,) in db.session.query(ProgressRecord.completed_at)
+        .filter(ProgressRecord.user_id == user.id, ProgressRecord.completed.is_(True))
+        if at is not None
+    )
+    total_score = _metric_value('total_score', user)
+    now = datetime.utcnow()
+    for rule in ACHIEVEMENTS:
+        if rule['metric'] == 'concepts_completed' and len(completed_at) >= rule['threshold']:
+            _award(user.id, [rule['code']], completed_at[rule['threshold'] - 1])
+        elif rule['metric'] == 'total_score' and total_score >= rule['threshold']:
+            _award(user.id, [rule['code']], now)
+
+def get_user_achievements(user_id):
+    """Earned badges with their dates, plus locked badges marked for display"""
+    earned = {row.code: row.earned_at for row in UserAchievement.query.filter_by(user_id=user_id)}
+    achievements = []
+    for rule in ACHIEVEMENTS:
+        if rule['code'] in earned or rule.get('show_locked'):
+            achievements.append({
+                'name': rule['name'],
+                'description': rule['description'],
+                'icon': rule['icon'],
+                'earned': rule['code'] in earned,
+                'date': earned.get(rule['code'])
+            })
+    return achievements
@@ -0,0 +1,135 @@
+"""
+Daily activity rollup for Math Quest
+
+Practice attempts and progress updates are folded into one
+``daily_user_activity`` row per user and UTC day with an atomic upsert, so
+weekly, monthly and streak views read a bounded number of rows no matter
+how long a user's attempt history is.
+"""
+
+from datetime import datetime, timedelta
+from sqlalchemy import func, case
+
+from app import db
+from models.activity import DailyUserActivity
+from models.practice import PracticeAttempt
+from services.upsert import dialect_insert
+
+COUNTERS = ('attempts', 'correct', 'points', 'time_spent', 'concepts_completed')
+
+def _upsert(rows):
+    stmt = dialect_insert(DailyUserActivity).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['user_id', 'day'],
+        set_={name: getattr(DailyUserActivity, name) + getattr(stmt.excluded, name) for name in COUNTERS}
+    )
+    db.session.execute(stmt)
+
+def record_activity(user_id, day=None, **counters):
+    """Add to a user's counters for a day (defaults to today, UTC)"""
+    row = {'user_id': user_id, 'day': day or datetime.utcnow().date()}
+    for name in COUNTERS:
+        row[name] = counters.get(name, 0)
+    _upsert([row])
+
+def record_attempt_activity(attempt_rows):
+    """Fold graded practice attempt rows into the daily rollup"""
+    totals = {}
+    for row in attempt_rows:
+        key = (row['user_id'], (row.get('completed_at') or datetime.utcnow()).date())
+        bucket = totals.setdefault(key, {'attempts': 0, 'correct': 0, 'points': 0, 'time_spent': 0})
+        bucket['attempts'] += 1
+        bucket['correct'] += 1 if row['is_correct'] else 0
+        bucket['points'] += row.get('score') or 0
+        bucket['time_spent'] += row.get('time_taken') or 0
+    if totals:
+        _upsert([{'user_id': user_id, 'day': day, 'concepts_completed': 0, **bucket}
+                 for (user_id, day), bucket in totals.items()])
+
+def rebuild_daily_activity(user_id=None):
+    """Recompute counters from the attempt log, e.g. for history recorded before the rollup existed
+
+    Time spent is replaced by the attempt time alone; completion counts
+    cannot be recovered from attempts and are left untouched.
+    """
+    # date() works on both SQLite (returns text) and PostgreSQL
+    day = func.date(PracticeAttempt.completed_at)
+    query = db.session.query(
+        PracticeAttempt.user_id, day,
+        func.count(PracticeAttempt.id),
+        func.sum(case((PracticeAttempt.is_correct, 1), else_=0)),
+        func.coalesce(func.sum(PracticeAttempt.score), 0),
+        func.coalesce(func.sum(PracticeAttempt.time_taken), 0)
+    ).group_by(PracticeAttempt.user_id, day)
+    if user_id is not None:
+        query = query.filter(PracticeAttempt.user_id == user_id)
+
+    rows = []
+    for uid, attempt_day, attempts, correct, points, time_spent in query:
+        if isinstance(attempt_day, str):
+            attempt_day = datetime.strptime(attempt_day, '%Y-%m-%d').date()
+        rows.append({'user_id': uid, 'day': attempt_day, 'attempts': attempts, 'correct': correct,
+                     'points': points, 'time_spent': time_spent, 'concepts_completed': 0})
+    if not rows:
+        return 0
+
+    for start in range(0, len(rows), 500):
+        chunk = dialect_insert(DailyUserActivity).values(rows[start:start + 500])
+        db.session.execute(chunk.on_conflict_do_update(
+            index_elements=['user_id', 'day'],
+            set_={name: getattr(chunk.excluded, name) for name in COUNTERS if name != 'concepts_completed'}
+        ))
+    return len(rows)
+
+def _shift_month(first_of_month, delta):
+    index = first_of_month.year * 12 + first_of_month.month - 1 + delta
+    return first_of_month.replace(year=index // 12, month=index % 12 + 1)
+
+def _period_summary(label, rows):
+    attempts = sum(r.attempts for r in rows)
+    correct = sum(r.correct for r in rows)
+    return {
+        'label': label,
+        'attempts': attempts,
+        'correct': correct,
+        'accuracy': (correct / attempts * 100) if attempts else 0,
+        'points': sum(r.points for r in rows),
+        'time_spent': sum(r.time_spent for r in rows),
+        'concepts_completed': sum(r.concepts_completed for r in rows),
+        'active_days': sum(1 for r in rows if r.attempts or r.concepts_completed)
+    }
+
+def get_activity_summary(user_id, weeks=4, months=6, today=None):
+    """Weekly and monthly summaries plus the current streak from the rollup
+
+    Reads at most about a year of daily rows for the user.
+    """
+    today = today or datetime.utcnow().date()
+    month_starts = [_shift_month(today.replace(day=1), -i) for i in range(months)]
+    since = min(month_starts[-1], today - timedelta(weeks=weeks), today - timedelta(days=365))
+    rows = DailyUserActivity.query.filter(
+        DailyUserActivity.user_id == user_id,
+        DailyUserActivity.day >= since,
+        DailyUserActivity.day <= today
+    ).order_by(DailyUserActivity.day.desc()).all()
+
+    weekly = []
+    for i in range(weeks):
+        end = today - timedelta(weeks=i)
+        start = end - timedelta(weeks=1)
+        weekly.append(_period_summary(f'Week {weeks - i}', [r for r in rows if start < r.day <= end]))
+
+    monthly = []
+    for start in month_starts:
+        rows_in_month = [r for r in rows if (r.day.year, r.day.month) == (start.year, start.month)]
+        monthly.append(_period_summary(start.strftime('%Y-%m'), rows_in_month))
+
+    # Consecutive active days ending today (or yesterday, if nothing yet today)
+    active_days = {r.day for r in rows if r.attempts}
+    streak = 0
+    day = today if today in active_days else today - timedelta(days=1)
+    while day in active_days:
+        streak += 1
+        day -= timedelta(days=1)
+
+    return {'weekly': weekly, 'monthly': monthly, 'current_streak': streak}
@@ -0,0 +1,37 @@
+"""
+In-memory answer key for grading practice problems
+
+Maps problem id to its pre-normalized answer and grading metadata, rebuilt
+once per content version, so grading a submission is a dict lookup.
+"""
+
+from collections import namedtuple
+
+from app import db
+from models.practice import PracticeProblem, normalize_answer
+from services.content import VersionedCache
+
+class AnswerKeyEntry(namedtuple('AnswerKeyEntry', 'problem_id concept_id answer points explanation')):
+    """Grading data for a single practice problem"""
+    __slots__ = ()
+
+    def check(self, user_answer):
+        """Check a submitted answer against the normalized correct answer"""
+        return normalize_answer(user_answer) == self.answer
+
+def _load_answer_key():
+    rows = db.session.query(
+        PracticeProblem.id, PracticeProblem.concept_id, PracticeProblem.correct_answer,
+        PracticeProblem.points, PracticeProblem.explanation
+    ).all()
+    return {
+        row.id: AnswerKeyEntry(row.id, row.concept_id, normalize_answer(row.correct_answer),
+                               row.points if row.points is not None else 10, row.explanation or None)
+        for row in rows
+    }
+
+_answer_key_cache = VersionedCache(_load_answer_key)
+
+def get_answer_key(problem_id):
+    """Return the AnswerKeyEntry for a problem, or None if it does not exist"""
+    return _answer_key_cache.get().get(problem_id)
@@ -0,0 +1,227 @@
+"""
+Write-behind buffer for practice attempts
+
+When ``ATTEMPT_WRITE_BEHIND`` is enabled, graded attempt rows are queued in
+process and written by a background thread in multi-row inserts, flushed
+whenever ``ATTEMPT_BUFFER_SIZE`` rows are waiting or every
+``ATTEMPT_FLUSH_INTERVAL`` seconds, and once more at interpreter shutdown.
+The queue holds at most ``ATTEMPT_QUEUE_MAX`` rows, including rows kept
+for retry after a failed flush; when it is full, producers wait up to
+``ATTEMPT_ENQUEUE_TIMEOUT`` seconds and then write their rows
+synchronously instead of dropping them. When a batch fails, its rows are
+retried one at a time: rows the database rejects (a constraint or data
+error) are logged and dropped, and the rest are written or, if the
+database is unavailable, kept for the next flush.
+
+With write-behind disabled (the default) rows are written immediately in
+the caller's transaction, which the caller commits, so each request makes
+one commit either way. Writing an attempt also updates everything derived
+from it (daily activity, score totals, mastery and review schedule) in the
+same transaction, so they cannot disagree. The background thread also
+folds pending score deltas and prunes the leaderboard change log when
+they are due, in both modes, so no request pays for either.
+"""
+
+import atexit
+import queue
+import threading
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError, DataError
+
+from app import db
+from models.practice import PracticeAttempt
+from services.activity import record_attempt_activity
+from services.answer_key import get_answer_key
+from services.leaderboard import record_points, prune_if_due
+from services.mastery import record_mastery
+from services.review import schedule_reviews
+from services.score_counters import fold_if_due
+
+class AttemptWriteBuffer:
+    """Queue practice attempt rows and insert them in batches"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self.enabled = False
+        self.batch_size = 100
+        self.flush_interval = 2.0
+        self.enqueue_timeout = 1.0
+        self._queue = None
+        self._slots = None  # One per row queued or kept for retry
+        self._thread = None
+        self._retry = []
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._wakeup = threading.Event()
+        self.stats = {'queued': 0, 'written': 0, 'batches': 0, 'sync_writes': 0, 'errors': 0, 'dropped': 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.enabled = app.config.get('ATTEMPT_WRITE_BEHIND', False)
+        self.batch_size = app.config.get('ATTEMPT_BUFFER_SIZE', 100)
+        self.flush_interval = app.config.get('ATTEMPT_FLUSH_INTERVAL', 2.0)
+        self.enqueue_timeout = app.config.get('ATTEMPT_ENQUEUE_TIMEOUT', 1.0)
+        self._queue = queue.Queue()
+        self._slots = threading.BoundedSemaphore(app.config.get('ATTEMPT_QUEUE_MAX', 10000))
+        app.extensions['attempt_buffer'] = self
+        if self.enabled:
+            atexit.register(self.shutdown)
+
+    def add(self, rows):
+        """Record graded attempt rows (dicts of PracticeAttempt columns)
+
+        Returns {(user_id, concept_id): mastery} for the rows written now,
+        in the caller's transaction; queued rows are not included.
+        """
+        rows = [_clean_row(row) for row in rows]
+        if not rows:
+            return {}
+        self._ensure_worker()
+        if not self.enabled:
+            return self._write_now(rows)
+
+        for index, row in enumerate(rows):
+            if not self._slots.acquire(timeout=self.enqueue_timeout):
+                # Back-pressure exhausted: write the rest ourselves rather than drop them
+                return self._write_now(rows[index:])
+            self._queue.put(row)
+            self.stats['queued'] += 1
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+        return {}
+
+    def _write_now(self, rows):
+        mastery = _insert_attempts(rows)
+        self.stats['sync_writes'] += len(rows)
+        return mastery
+
+    def _ensure_worker(self):
+        # Started lazily so each forked worker process gets its own thread
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='attempt-write-behind', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+            with self.app.app_context():
+                try:
+                    fold_if_due()
+                    prune_if_due()
+                finally:
+                    db.session.remove()
+
+    def _drain(self):
+        rows, self._retry = self._retry, []
+        while True:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                return rows
+
+    def flush(self):
+        """Write every queued row now; returns the number of rows written"""
+        if self._queue is None:
+            return 0
+        with self._flush_lock:
+            rows = self._drain()
+            if not rows:
+                return 0
+            with self.app.app_context():
+                try:
+                    for start in range(0, len(rows), self.batch_size):
+                        _insert_attempts(rows[start:start + self.batch_size])
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    self.stats['errors'] += 1
+                    self.app.logger.exception('Failed to flush %d buffered practice attempts; '
+                                              'retrying them one at a time', len(rows))
+                    return self._write_one_by_one(rows)
+                else:
+                    self._release(len(rows))
+                    self.stats['written'] += len(rows)
+                    self.stats['batches'] += 1
+                    return len(rows)
+                finally:
+                    db.session.remove()
+
+    def _write_one_by_one(self, rows):
+        written = 0
+        for index, row in enumerate(rows):
+            try:
+                _insert_attempts([row])
+                db.session.commit()
+            except (IntegrityError, DataError):
+                # The row itself is bad (e.g. its problem was deleted); retrying cannot help
+                db.session.rollback()
+                self._release(1)
+                self.stats['dropped'] += 1
+                self.app.logger.exception('Dropped buffered practice attempt %r', row)
+                continue
+            except Exception:
+                # Most likely the database is unavailable; keep this row and the rest
+                db.session.rollback()
+                self._retry = rows[index:]
+                self.app.logger.exception('Kept %d buffered practice attempts for the next flush',
+                                          len(self._retry))
+                return written
+            self._release(1)
+            self.stats['written'] += 1
+            written += 1
+        return written
+
+    def _release(self, count):
+        for _ in range(count):
+            self._slots.release()
+
+    def shutdown(self):
+        """Stop the worker thread and flush what is left"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._wakeup.set()
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+def _clean_row(row):
+    """Coerce request values to the column types, so one odd answer cannot fail a whole batch"""
+    row = dict(row)
+    answer = row.get('user_answer')
+    row['user_answer'] = '' if answer is None else str(answer)
+    try:
+        row['time_taken'] = max(0, int(row.get('time_taken') or 0))
+    except (TypeError, ValueError):
+        row['time_taken'] = 0
+    return row
+
+def _insert_attempts(rows):
+    """Insert attempt rows and apply them to activity, score totals, mastery and reviews
+
+    Returns {(user_id, concept_id): mastery} after the rows.
+    """
+    db.session.execute(insert(PracticeAttempt), rows)
+    record_attempt_activity(rows)
+    points = {}
+    outcomes = {}
+    answers = {}
+    for row in rows:
+        points[row['user_id']] = points.get(row['user_id'], 0) + (row.get('score') or 0)
+        entry = get_answer_key(row['problem_id'])
+        if entry is not None:
+            outcomes.setdefault((row['user_id'], entry.concept_id), []).append(row['is_correct'])
+        answers.setdefault(row['user_id'], []).append((row['problem_id'], row['is_correct'], row['time_taken']))
+    record_points(points)
+    for user_id, user_answers in answers.items():
+        schedule_reviews(user_id, user_answers)
+    return {key: record_mastery(key[0], key[1], concept_outcomes).mastery
+            for key, concept_outcomes in outcomes.items()}
+
+attempt_buffer = AttemptWriteBuffer()
@@ -0,0 +1,120 @@
+"""
+Item difficulty calibration from the practice attempt log
+
+Fits a difficulty for every practice problem from how students actually
+answer it, using an Elo-style online Rasch model. Each chunk of attempts
+moves student abilities and problem difficulties toward the observed
+results by a Newton step weighted by the information gathered so far, so
+steps shrink as a student or problem accumulates attempts. Attempts are
+read in primary-key order in fixed-size chunks and each chunk is applied
+as one vectorized NumPy update, so memory is bounded by the chunk size
+plus a few numbers per user and per problem.
+
+NumPy is an optional dependency (``pip install numpy``) only needed to
+run this job, via ``flask calibrate``.
+"""
+
+from itertools import chain
+from sqlalchemy import select, update
+
+from app import db
+from models.practice import PracticeAttempt, PracticeProblem
+from models.user import User
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_CHUNK_SIZE = 100000
+DEFAULT_PASSES = 2
+PRIOR_INFORMATION = 1.0  # Weight of the starting estimate, worth four attempts at even odds
+MAX_STEP = 1.0           # Largest change in logits from a single chunk
+HAND_SET_SCALE = 0.5     # Logits per point of the hand-set 1-5 difficulty
+
+def calibrate_difficulty(chunk_size=DEFAULT_CHUNK_SIZE, passes=DEFAULT_PASSES):
+    """Fit problem difficulties from all attempts and write them back
+
+    Returns the number of attempts read per pass and of problems updated.
+    """
+    if np is None:
+        raise RuntimeError('Difficulty calibration requires NumPy (pip install numpy)')
+
+    user_ids = np.fromiter(db.session.scalars(select(User.id).order_by(User.id)), dtype=np.int64)
+    problems = db.session.execute(
+        select(PracticeProblem.id, PracticeProblem.difficulty).order_by(PracticeProblem.id)
+    ).all()
+    problem_ids = np.array([row.id for row in problems], dtype=np.int64)
+
+    # Start from the hand-set difficulty, centred on 3
+    difficulty = np.array([((row.difficulty or 3) - 3) * HAND_SET_SCALE for row in problems], dtype=np.float64)
+    ability = np.zeros(len(user_ids), dtype=np.float64)
+    problem_counts = np.zeros(len(problem_ids), dtype=np.int64)
+
+    attempts = 0
+    for pass_number in range(passes):
+        user_information = np.full(len(user_ids), PRIOR_INFORMATION)
+        problem_information = np.full(len(problem_ids), PRIOR_INFORMATION)
+        attempts = 0
+        for user_idx, problem_idx, correct in _attempt_chunks(chunk_size, user_ids, problem_ids):
+            attempts += len(correct)
+            expected = 1.0 / (1.0 + np.exp(difficulty[problem_idx] - ability[user_idx]))
+            error = correct - expected
+            weight = expected * (1.0 - expected)
+            _newton_step(ability, user_information, user_idx, error, weight)
+            _newton_step(difficulty, problem_information, problem_idx, -error, weight)
+            if pass_number == 0:
+                np.add.at(problem_counts, problem_idx, 1)
+        db.session.rollback()
+
+    # Problems are only identifiable up to a shift; anchor the attempted ones at 0
+    attempted = problem_counts > 0
+    if attempted.any():
+        difficulty[attempted] -= difficulty[attempted].mean()
+
+    rows = [
+        {'id': int(problem_id), 'calibrated_difficulty': float(value), 'calibration_attempts': int(count)}
+        for problem_id, value, count in zip(problem_ids[attempted], difficulty[attempted], problem_counts[attempted])
+    ]
+    # Bulk UPDATE by primary key; calibration is not lesson content, so this
+    # deliberately does not bump the content version
+    for start in range(0, len(rows), chunk_size):
+        db.session.execute(update(PracticeProblem), rows[start:start + chunk_size])
+    db.session.commit()
+    return {'attempts': attempts, 'problems': len(rows)}
+
+def _newton_step(values, information, idx, gradient, weight):
+    """Move each touched estimate by its summed gradient over accumulated information"""
+    keys, inverse = np.unique(idx, return_inverse=True)
+    information[keys] += np.bincount(inverse, weights=weight)
+    step = np.bincount(inverse, weights=gradient) / information[keys]
+    values[keys] += np.clip(step, -MAX_STEP, MAX_STEP)
+
+def _attempt_chunks(chunk_size, user_ids, problem_ids):
+    """Yield (user index, problem index, correct) arrays in attempt id order
+
+    Uses keyset pagination on the primary key, so each chunk is an index
+    range scan and no cursor is held open between chunks.
+    """
+    table = PracticeAttempt.__table__
+    connection = db.session.connection()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            select(table.c.id, table.c.user_id, table.c.problem_id, table.c.is_correct)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            return
+        # fromiter over flattened tuples avoids numpy probing each Row object
+        chunk = np.fromiter(chain.from_iterable(rows), dtype=np.int64, count=4 * len(rows)).reshape(-1, 4)
+        last_id = int(chunk[-1, 0])
+
+        user_idx = np.searchsorted(user_ids, chunk[:, 1])
+        problem_idx = np.searchsorted(problem_ids, chunk[:, 2])
+        # Skip attempts whose user or problem no longer exists
+        known = (user_idx < len(user_ids)) & (problem_idx < len(problem_ids))
+        known[known] &= (user_ids[user_idx[known]] == chunk[known, 1]) & (problem_ids[problem_idx[known]] == chunk[known, 2])
+        yield user_idx[known], problem_idx[known], chunk[known, 3].astype(np.float64)
@@ -0,0 +1,121 @@
+"""
+Content versioning for Math Quest
+
+Curriculum content (concepts and practice problems) only changes when it is
+seeded, so derived data is cached per process and keyed by a version counter
+stored in the ``content_version`` table. The counter is bumped in the same
+transaction as any ORM write to content rows, and each process re-reads it
+at most once per ``CONTENT_VERSION_TTL`` seconds.
+"""
+
+import threading
+import time
+from datetime import datetime
+from flask import current_app, g, has_app_context
+from sqlalchemy import event, select, update, insert
+from sqlalchemy.orm import Session
+
+from app import db
+from models.concept import Concept
+from models.practice import PracticeProblem
+from models.content import ContentVersion
+
+CONTENT_MODELS = (Concept, PracticeProblem)
+
+_ROW_ID = 1
+_state = {'version': None, 'checked_at': float('-inf')}
+_state_lock = threading.Lock()
+
+def get_content_version():
+    """Return the current content version
+
+    The counter is re-read at most once per TTL and at most once per request,
+    so repeated lookups while rendering a page cost nothing.
+    """
+    if 'content_version' in g:
+        return g.content_version
+
+    ttl = current_app.config.get('CONTENT_VERSION_TTL', 5)
+    now = time.monotonic()
+    if _state['version'] is None or now - _state['checked_at'] >= ttl:
+        with _state_lock:
+            if _state['version'] is None or now - _state['checked_at'] >= ttl:
+                version = db.session.execute(
+                    select(ContentVersion.version).where(ContentVersion.id == _ROW_ID)
+                ).scalar()
+                _state['version'] = version or 0
+                _state['checked_at'] = now
+
+    g.content_version = _state['version']
+    return g.content_version
+
+def expire_content_version():
+    """Force the next get_content_version() call to re-read the counter"""
+    _state['checked_at'] = float('-inf')
+    if has_app_context():
+        g.pop('content_version', None)
+
+def bump_content_version(connection):
+    """Increment the stored content version on the given connection"""
+    result = connection.execute(
+        update(ContentVersion.__table__)
+        .where(ContentVersion.__table__.c.id == _ROW_ID)
+        .values(version=ContentVersion.__table__.c.version + 1, updated_at=datetime.utcnow())
+    )
+    if result.rowcount == 0:
+        connection.execute(
+            insert(ContentVersion.__table__)
+            .values(id=_ROW_ID, version=1, updated_at=datetime.utcnow())
+        )
+
+def mark_content_changed(session):
+    """Bump the content version for changes made with bulk or Core statements
+
+    ORM flushes of content models are tracked automatically; statements
+    that bypass the flush must call this before committing.
+    """
+    bump_content_version(session.connection())
+    session.info['content_committing'] = True
+
+class VersionedCache:
+    """Process-wide value rebuilt whenever the content version changes"""
+
+    def __init__(self, builder):
+        self._builder = builder
+        self._value = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        version = get_content_version()
+        if self._version == version:
+            return self._value
+        with self._lock:
+            if self._version != version:
+                self._value = self._builder()
+                self._version = version
+            return self._value
+
+    def invalidate(self):
+        self._version = None
+
+# Bump the stored version in the same transaction as any content write
+@event.listens_for(Session, 'before_flush')
+def _track_content_changes(session, flush_context, instances):
+    if any(isinstance(obj, CONTENT_MODELS) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info['content_changed'] = True
+
+@event.listens_for(Session, 'after_flush')
+def _bump_on_flush(session, flush_context):
+    if session.info.pop('content_changed', False):
+        mark_content_changed(session)
+
+@event.listens_for(Session, 'after_commit')
+def _expire_on_commit(session):
+    if session.info.pop('content_committing', False):
+        expire_content_version()
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_on_rollback(session):
+    session.info.pop('content_changed', None)
+    session.info.pop('content_committing', None)
@@ -0,0 +1,184 @@
+"""
+Curriculum content loader for Math Quest
+
+Curriculum content lives in ``content/concepts/<slug>.json``, one file per
+concept with its lesson, examples and practice problems. The loader
+compares each file's hash with ``Concept.content_hash`` and rewrites only
+the concepts that changed, using bulk inserts and updates in a single
+transaction. Problems are matched by their ``key`` so existing attempts
+keep pointing at the same rows.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from sqlalchemy import insert, update
+
+from app import db
+from models.concept import Concept
+from models.practice import PracticeProblem, PracticeAttempt
+from services.content import mark_content_changed
+
+CONTENT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'content', 'concepts')
+
+CONCEPT_FIELDS = ('slug', 'name', 'description', 'category', 'order_in_curriculum', 'lesson_content')
+PROBLEM_FIELDS = ('key', 'question', 'problem_type', 'correct_answer')
+
+class ContentError(ValueError):
+    """Raised when a content file is malformed"""
+
+def content_files(directory=CONTENT_DIR):
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.json')
+    )
+
+def content_hash(directory=CONTENT_DIR):
+    """SHA-256 over every content file, used to skip loading when nothing changed"""
+    digest = hashlib.sha256()
+    for path in content_files(directory):
+        digest.update(os.path.basename(path).encode())
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def read_content(directory=CONTENT_DIR):
+    """Read and validate every concept file"""
+    documents = []
+    for path in content_files(directory):
+        with open(path, encoding='utf-8') as f:
+            raw = f.read()
+        try:
+            doc = json.loads(raw)
+        except ValueError as e:
+            raise ContentError(f'{path}: {e}') from e
+        missing = [field for field in CONCEPT_FIELDS if field not in doc]
+        if missing:
+            raise ContentError(f'{path}: missing {", ".join(missing)}')
+        for problem in doc.get('problems', []):
+            missing = [field for field in PROBLEM_FIELDS if field not in problem]
+            if missing:
+                raise ContentError(f'{path}: problem {problem.get("key", "?")} missing {", ".join(missing)}')
+        doc['_hash'] = hashlib.sha256(raw.encode('utf-8')).hexdigest()
+        documents.append(doc)
+
+    _check_unique([d['slug'] for d in documents], 'concept slug')
+    _check_unique([p['key'] for d in documents for p in d.get('problems', [])], 'problem key')
+    return documents
+
+def _check_unique(values, label):
+    seen = set()
+    for value in values:
+        if value in seen:
+            raise ContentError(f'Duplicate {label}: {value}')
+        seen.add(value)
+
+def _concept_row(doc, now):
+    lesson = doc['lesson_content']
+    return {
+        'slug': doc['slug'],
+        'name': doc['name'],
+        'description': doc['description'],
+        'category': doc['category'],
+        'difficulty_level': doc.get('difficulty_level', 1),
+        'order_in_curriculum': doc['order_in_curriculum'],
+        'lesson_content': '\n'.join(lesson) if isinstance(lesson, list) else lesson,
+        'examples': json.dumps(doc.get('examples', [])),
+        'prerequisites': ','.join(doc.get('prerequisites', [])),
+        'content_hash': doc['_hash'],
+        'updated_at': now
+    }
+
+def _problem_row(problem, concept_id):
+    options = problem.get('options')
+    return {
+        'concept_id': concept_id,
+        'content_key': problem['key'],
+        'question': problem['question'],
+        'problem_type': problem['problem_type'],
+        'correct_answer': problem['correct_answer'],
+        'options': json.dumps(options) if options else None,
+        'explanation': problem.get('explanation'),
+        'difficulty': problem.get('difficulty', 1),
+        'points': problem.get('points', 10),
+        'time_limit': problem.get('time_limit', 120)
+    }
+
+def load_content(directory=CONTENT_DIR):
+    """Apply changed content files to the database in one transaction
+
+    Returns counts of what changed. Problems removed from a file are deleted
+    unless students have attempted them, in which case they are kept and
+    reported under ``kept_problems``.
+    """
+    documents = read_content(directory)
+    stats = {'concepts_added': 0, 'concepts_updated': 0, 'problems_added': 0,
+             'problems_updated': 0, 'problems_deleted': 0, 'kept_problems': []}
+
+    existing = {row.slug: row for row in db.session.query(Concept.id, Concept.slug, Concept.content_hash)}
+    # Curriculum order, so new concepts and problems get ids in that order
+    changed = sorted((doc for doc in documents if doc['slug'] not in existing
+                      or existing[doc['slug']].content_hash != doc['_hash']),
+                     key=lambda doc: (doc['order_in_curriculum'], doc['slug']))
+    if not changed:
+        return stats
+
+    now = datetime.utcnow()
+    new_rows = [_concept_row(doc, now) for doc in changed if doc['slug'] not in existing]
+    update_rows = [dict(_concept_row(doc, now), id=existing[doc['slug']].id)
+                   for doc in changed if doc['slug'] in existing]
+
+    concept_ids = {doc['slug']: existing[doc['slug']].id for doc in changed if doc['slug'] in existing}
+    if new_rows:
+        for row in new_rows:
+            row['created_at'] = now
+        result = db.session.execute(insert(Concept).returning(Concept.id, Concept.slug), new_rows)
+        concept_ids.update({row.slug: row.id for row in result})
+    if update_rows:
+        db.session.execute(update(Concept), update_rows)
+    stats['concepts_added'] = len(new_rows)
+    stats['concepts_updated'] = len(update_rows)
+
+    # Match existing problems of the changed concepts by key, falling back
+    # to the question text for rows loaded before keys existed
+    current = db.session.query(
+        PracticeProblem.id, PracticeProblem.concept_id, PracticeProblem.content_key, PracticeProblem.question
+    ).filter(PracticeProblem.concept_id.in_(concept_ids.values())).all()
+    by_key = {row.content_key: row.id for row in current if row.content_key}
+    by_question = {(row.concept_id, row.question): row.id for row in current if not row.content_key}
+
+    problem_inserts, problem_updates, matched = [], [], set()
+    for doc in changed:
+        concept_id = concept_ids[doc['slug']]
+        for problem in doc.get('problems', []):
+            row = _problem_row(problem, concept_id)
+            problem_id = by_key.get(problem['key']) or by_question.pop((concept_id, problem['question']), None)
+            if problem_id is None:
+                row['created_at'] = now
+                problem_inserts.append(row)
+            else:
+                matched.add(problem_id)
+                problem_updates.append(dict(row, id=problem_id))
+
+    if problem_inserts:
+        db.session.execute(insert(PracticeProblem), problem_inserts)
+    if problem_updates:
+        db.session.execute(update(PracticeProblem), problem_updates)
+    stats['problems_added'] = len(problem_inserts)
+    stats['problems_updated'] = len(problem_updates)
+
+    removed = [row.id for row in current if row.id not in matched]
+    if removed:
+        attempted = {pid for (pid,) in db.session.query(PracticeAttempt.problem_id)
+                     .filter(PracticeAttempt.problem_id.in_(removed)).distinct()}
+        deletable = [pid for pid in removed if pid not in attempted]
+        if deletable:
+            db.session.query(PracticeProblem).filter(PracticeProblem.id.in_(deletable))\
+                .delete(synchronize_session=False)
+        stats['problems_deleted'] = len(deletable)
+        stats['kept_problems'] = sorted(attempted)
+
+    # Bulk statements bypass the ORM flush hooks, so bump the version here
+    mark_content_changed(db.session)
+    db.session.commit()
+    return stats
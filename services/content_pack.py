@@ -0,0 +1,161 @@
+"""
+Compiled, read-only curriculum content pack for Math Quest
+
+``build_pack`` writes every concept and practice problem into one file:
+
+    8-byte magic | uint32 index length | JSON index | JSON records
+
+The index maps concept ids, slugs and problem ids to the byte range of
+their record. ``ContentPack`` memory-maps the file and decodes a record
+only when it is read, so every worker process shares the same
+page-cache-backed bytes and lesson reads need no database connection.
+"""
+
+import json
+import mmap
+import os
+import struct
+from datetime import datetime
+from sqlalchemy import DateTime
+
+from app import db
+from models.concept import Concept
+from models.content import ContentVersion
+from models.practice import PracticeProblem
+
+MAGIC = b'MQPACK1\n'
+_HEADER = struct.Struct('<8sI')
+
+class ContentPackError(ValueError):
+    """Raised when a content pack file is missing parts or has the wrong format"""
+
+def _datetime_columns(model):
+    return frozenset(c.key for c in model.__table__.columns if isinstance(c.type, DateTime))
+
+_DATETIME_COLUMNS = {Concept: _datetime_columns(Concept), PracticeProblem: _datetime_columns(PracticeProblem)}
+
+def _encode(obj):
+    record = {}
+    for column in obj.__table__.columns:
+        value = getattr(obj, column.key)
+        record[column.key] = value.isoformat() if isinstance(value, datetime) else value
+    return json.dumps(record, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def _decode(model, data):
+    record = json.loads(data)
+    for key in _DATETIME_COLUMNS[model]:
+        if record.get(key):
+            record[key] = datetime.fromisoformat(record[key])
+    return model(**record)
+
+def build_pack(path):
+    """Compile the curriculum in the database into a content pack at ``path``
+
+    The file is written next to its destination and renamed into place, so
+    running workers never see a partially written pack.
+    """
+    concepts = Concept.query.order_by(Concept.order_in_curriculum).all()
+    problems = PracticeProblem.query.order_by(PracticeProblem.id).all()
+    version = db.session.get(ContentVersion, 1)
+
+    problems_by_concept = {}
+    for problem in problems:
+        problems_by_concept.setdefault(problem.concept_id, []).append(problem)
+
+    records = []
+    index = {
+        'content_version': version.version if version else 0,
+        'content_hash': version.content_hash if version else None,
+        'concepts': []
+    }
+    offset = 0
+
+    def add(record):
+        nonlocal offset
+        records.append(record)
+        span = [offset, len(record)]
+        offset += len(record)
+        return span
+
+    for concept in concepts:
+        index['concepts'].append({
+            'id': concept.id,
+            'slug': concept.slug,
+            'record': add(_encode(concept)),
+            'problems': [[p.id] + add(_encode(p)) for p in problems_by_concept.get(concept.id, [])]
+        })
+
+    # Record offsets are relative to the end of the index
+    index_bytes = json.dumps(index, separators=(',', ':')).encode('utf-8')
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, len(index_bytes)))
+        f.write(index_bytes)
+        for record in records:
+            f.write(record)
+    os.replace(tmp_path, path)
+    return {'concepts': len(concepts), 'problems': len(problems), 'bytes': _HEADER.size + len(index_bytes) + offset}
+
+class ContentPack:
+    """Read-only view of a content pack file"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.stat = os.fstat(f.fileno())
+            if self.stat.st_size < _HEADER.size:
+                raise ContentPackError(f'{path}: file too short')
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, index_length = _HEADER.unpack_from(self._data)
+        if magic != MAGIC:
+            raise ContentPackError(f'{path}: not a content pack')
+        self._base = _HEADER.size + index_length
+        index = json.loads(self._data[_HEADER.size:self._base])
+
+        self.content_version = index['content_version']
+        self.content_hash = index['content_hash']
+        self.concept_ids = [entry['id'] for entry in index['concepts']]
+        self._concepts = {entry['id']: entry['record'] for entry in index['concepts']}
+        self._slugs = {entry['slug']: entry['id'] for entry in index['concepts']}
+        self._concept_problems = {entry['id']: [p[0] for p in entry['problems']] for entry in index['concepts']}
+        self._problems = {p[0]: p[1:] for entry in index['concepts'] for p in entry['problems']}
+
+    def _read(self, model, span):
+        start = self._base + span[0]
+        return _decode(model, self._data[start:start + span[1]])
+
+    def is_current(self):
+        """Whether the file on disk is still the one that was opened"""
+        try:
+            current = os.stat(self.path)
+        except OSError:
+            return False
+        return (current.st_ino, current.st_mtime_ns) == (self.stat.st_ino, self.stat.st_mtime_ns)
+
+    def concepts(self):
+        """All concepts in curriculum order"""
+        return [self._read(Concept, self._concepts[cid]) for cid in self.concept_ids]
+
+    def concept(self, concept_id):
+        span = self._concepts.get(concept_id)
+        return self._read(Concept, span) if span else None
+
+    def concept_by_slug(self, slug):
+        return self.concept(self._slugs.get(slug))
+
+    def problems(self, concept_id, limit=None):
+        """Practice problems of a concept in id order"""
+        ids = self._concept_problems.get(concept_id, [])
+        if limit is not None:
+            ids = ids[:limit]
+        return [self._read(PracticeProblem, self._problems[pid]) for pid in ids]
+
+    def all_problems(self):
+        """Every practice problem in the pack"""
+        return [self._read(PracticeProblem, span) for span in self._problems.values()]
+
+    def problem(self, problem_id):
+        span = self._problems.get(problem_id)
+        return self._read(PracticeProblem, span) if span else None
@@ -0,0 +1,113 @@
+"""
+Read access to lesson and problem content for Math Quest
+
+Routes read concepts and practice problems through ``content_provider``.
+With ``CONTENT_SOURCE = 'database'`` (the default) reads use the cached
+concept list and ordinary queries. With ``CONTENT_SOURCE = 'pack'`` they
+come from the compiled content pack at ``CONTENT_PACK_PATH`` (see
+services/content_pack.py) and do not use a database connection. The pack
+file is checked for replacement at most every ``CONTENT_VERSION_TTL``
+seconds. If it is missing or unreadable, reads fall back to the database.
+
+Concepts from either source are not attached to a session, so callers
+should only use their column attributes. Problems are returned as
+read-only ProblemView tuples (see services/problem_views.py).
+"""
+
+import os
+import threading
+import time
+
+from services.content_pack import ContentPack, ContentPackError
+from services.curriculum import get_ordered_concepts, get_concept_by_slug
+from services.problem_views import ProblemIndex, ProblemView, get_problem_index
+
+class ContentProvider:
+    """Serve concept and problem reads from the database or a content pack"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self.source = 'database'
+        self.pack_path = None
+        self.check_interval = 5
+        self._pack = None
+        self._pack_problems = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.source = app.config.get('CONTENT_SOURCE', 'database')
+        self.pack_path = app.config.get('CONTENT_PACK_PATH') or os.path.join(app.instance_path, 'content.pack')
+        self.check_interval = app.config.get('CONTENT_VERSION_TTL', 5)
+        self._pack = None
+        self._pack_problems = None
+        self._checked_at = None
+        app.extensions['content_provider'] = self
+
+    def get_pack(self):
+        """Return the open content pack, or None when reading from the database"""
+        if self.source != 'pack':
+            return None
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return self._pack
+        with self._lock:
+            if self._checked_at is None or now - self._checked_at >= self.check_interval:
+                if self._pack is None or not self._pack.is_current():
+                    self._pack = self._open_pack()
+                    self._pack_problems = None
+                self._checked_at = now
+        return self._pack
+
+    def _open_pack(self):
+        try:
+            return ContentPack(self.pack_path)
+        except (OSError, ContentPackError) as e:
+            self.app.logger.warning('Content pack unavailable, reading content from the database: %s', e)
+            return None
+
+    def concepts(self):
+        """All concepts in curriculum order"""
+        pack = self.get_pack()
+        if pack is not None:
+            return pack.concepts()
+        return get_ordered_concepts()
+
+    def concept(self, concept_id):
+        pack = self.get_pack()
+        if pack is not None:
+            return pack.concept(concept_id)
+        return next((c for c in get_ordered_concepts() if c.id == concept_id), None)
+
+    def concept_by_slug(self, slug):
+        pack = self.get_pack()
+        if pack is not None:
+            return pack.concept_by_slug(slug)
+        return get_concept_by_slug(slug)
+
+    def problem_index(self):
+        """Problem views for the current pack or content version"""
+        pack = self.get_pack()
+        if pack is None:
+            return get_problem_index()
+        index = self._pack_problems
+        if index is None or index[0] is not pack:
+            index = (pack, ProblemIndex(ProblemView.from_row(p) for p in pack.all_problems()))
+            self._pack_problems = index
+        return index[1]
+
+    def problems(self, concept_id, limit=None):
+        """Practice problem views of a concept in id order"""
+        return self.problem_index().problems(concept_id, limit)
+
+    def problem(self, problem_id):
+        return self.problem_index().problem(problem_id)
+
+    def draw_problems(self, concept_id, count, mix=None):
+        """Random problem views of a concept, optionally weighted by difficulty"""
+        return self.problem_index().draw(concept_id, count, mix)
+
+content_provider = ContentProvider()
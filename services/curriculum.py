@@ -0,0 +1,131 @@
+"""
+In-memory curriculum graph for Math Quest
+
+Resolves concept prerequisites once per content version so availability
+checks, "next concept" lookups and unlock queries never touch the database,
+and keeps the ordered concept list that nearly every page renders.
+"""
+
+import heapq
+from sqlalchemy.orm import Session
+
+from app import db
+from models.concept import Concept
+from models.user import CompletionBitmap
+from services.content import VersionedCache
+
+class CurriculumGraph:
+    """Prerequisite graph built from the concept table"""
+
+    def __init__(self, rows):
+        """Build the graph from (id, slug, order_in_curriculum, prerequisites) rows"""
+        rows = list(rows)
+        self.slug_to_id = {slug: concept_id for concept_id, slug, _, _ in rows}
+        self.id_to_slug = {concept_id: slug for concept_id, slug, _, _ in rows}
+        self.prerequisite_ids = {}
+        self.prerequisite_masks = {}
+        self.unlocks = {concept_id: set() for concept_id, _, _, _ in rows}
+
+        for concept_id, _, _, prerequisites in rows:
+            prereq_ids = frozenset(self.resolve_slugs(_split_slugs(prerequisites)))
+            self.prerequisite_ids[concept_id] = prereq_ids
+            self.prerequisite_masks[concept_id] = CompletionBitmap.from_ids(prereq_ids).mask
+            for prereq_id in prereq_ids:
+                self.unlocks[prereq_id].add(concept_id)
+
+        self.order = self._topological_order({concept_id: order for concept_id, _, order, _ in rows})
+
+    def __len__(self):
+        return len(self.order)
+
+    @classmethod
+    def load(cls):
+        """Load the graph with a single column-only query"""
+        rows = db.session.query(
+            Concept.id, Concept.slug, Concept.order_in_curriculum, Concept.prerequisites
+        ).all()
+        return cls(rows)
+
+    def _topological_order(self, curriculum_order):
+        """Kahn's algorithm, breaking ties by curriculum order"""
+        remaining = {cid: len(prereqs) for cid, prereqs in self.prerequisite_ids.items()}
+        heap = [(curriculum_order[cid] or 0, cid) for cid, count in remaining.items() if count == 0]
+        heapq.heapify(heap)
+
+        order = []
+        while heap:
+            _, concept_id = heapq.heappop(heap)
+            order.append(concept_id)
+            for dependent in self.unlocks[concept_id]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    heapq.heappush(heap, (curriculum_order[dependent] or 0, dependent))
+
+        # Concepts caught in a prerequisite cycle still get a stable position
+        if len(order) < len(remaining):
+            placed = set(order)
+            order.extend(sorted((cid for cid in remaining if cid not in placed),
+                                key=lambda cid: (curriculum_order[cid] or 0, cid)))
+        return order
+
+    def resolve_slugs(self, slugs):
+        """Map prerequisite slugs to concept ids, ignoring unknown slugs"""
+        return [self.slug_to_id[slug] for slug in slugs if slug in self.slug_to_id]
+
+    def is_available(self, concept_id, completed_ids):
+        """Check whether every prerequisite of a concept is completed
+
+        ``completed_ids`` may be a set of ids or a user's CompletionBitmap,
+        in which case the check is a single mask operation.
+        """
+        if isinstance(completed_ids, CompletionBitmap):
+            return completed_ids.issuperset_mask(self.prerequisite_masks.get(concept_id, 0))
+        return self.prerequisite_ids.get(concept_id, frozenset()).issubset(completed_ids)
+
+    def next_concept_id(self, completed_ids):
+        """First concept in prerequisite order that is available but not completed"""
+        for concept_id in self.order:
+            if concept_id not in completed_ids and self.is_available(concept_id, completed_ids):
+                return concept_id
+        return None
+
+    def unlocked_by(self, concept_id, completed_ids=()):
+        """Concepts that become available once the given concept is completed"""
+        after = set(completed_ids)
+        after.add(concept_id)
+        return [dependent for dependent in self.order
+                if dependent in self.unlocks.get(concept_id, ())
+                and dependent not in after
+                and self.is_available(dependent, after)]
+
+def _split_slugs(prerequisites):
+    if not prerequisites:
+        return []
+    return [p.strip() for p in prerequisites.split(',') if p.strip()]
+
+def _load_ordered_concepts():
+    """Load concepts in curriculum order as detached, fully loaded instances"""
+    with Session(bind=db.engine, expire_on_commit=False) as session:
+        return session.query(Concept).order_by(Concept.order_in_curriculum).all()
+
+_graph_cache = VersionedCache(CurriculumGraph.load)
+_concepts_cache = VersionedCache(_load_ordered_concepts)
+
+def get_curriculum_graph():
+    """Return the process-wide curriculum graph for the current content version"""
+    return _graph_cache.get()
+
+def get_ordered_concepts():
+    """Return the cached list of concepts ordered by curriculum position
+
+    The instances are detached from any session, so only column attributes
+    may be used on them; relationships are not loaded.
+    """
+    return _concepts_cache.get()
+
+def get_concept_by_slug(slug):
+    """Return the cached (detached) concept with the given slug, or None"""
+    concept_id = get_curriculum_graph().slug_to_id.get(slug)
+    if concept_id is None:
+        return None
+    return next((c for c in get_ordered_concepts() if c.id == concept_id), None)
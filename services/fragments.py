@@ -0,0 +1,59 @@
+"""
+Rendered template fragment cache for Math Quest
+
+Lesson pages render the heaviest part of the page, the lesson body and
+the decoded examples, through ``cached_fragment`` in templates. The
+rendered HTML is kept in a bounded per-process LRU cache keyed by
+template, concept id and ``updated_at``, so each section is rendered once
+per content version. A content change updates ``updated_at``, so stale
+fragments are never hit again and age out of the LRU.
+"""
+
+import threading
+from collections import OrderedDict
+from flask import render_template
+from markupsafe import Markup
+
+MAX_CACHED_FRAGMENTS = 500
+
+class FragmentCache:
+    """Bounded LRU of rendered HTML with hit/miss counters"""
+
+    def __init__(self, max_size=MAX_CACHED_FRAGMENTS):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return html
+            self.stats['misses'] += 1
+
+        # Render outside the lock; a concurrent miss just renders twice
+        html = Markup(render())
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+        return html
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+fragment_cache = FragmentCache()
+
+def cached_fragment(template_name, concept):
+    """Render a per-concept template fragment, reusing it until the concept changes"""
+    key = (template_name, concept.id, concept.updated_at)
+    return fragment_cache.get_or_render(key, lambda: render_template(template_name, concept=concept))
@@ -0,0 +1,388 @@
+"""
+Leaderboards for Math Quest
+
+Three kinds of board rank users by score: ``global`` (total points from
+every graded attempt, see services.score_counters), ``weekly`` (points earned since Monday,
+UTC, from the daily activity rollup) and ``concept`` (best
+``ProgressRecord.score`` on one concept). Each process keeps the boards in
+memory as ``ScoreIndex`` objects, so top-K and "my rank" lookups take
+O(log n) steps in the number n of distinct scores.
+
+Scoring writes add a ``leaderboard_change`` row per affected user in the
+same transaction. At most once per ``LEADERBOARD_SYNC_INTERVAL`` seconds a
+process reads the changes it has not seen yet and re-reads only those
+users' scores. Boards are rebuilt from the source tables on first use, at
+the start of each week (weekly board) and after a process has been idle
+for longer than the change log is kept.
+"""
+
+import heapq
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import select, insert, update, delete, func, event, literal, tuple_
+from sqlalchemy.orm import Session
+
+from app import db
+from models.user import User
+from models.progress import ProgressRecord
+from models.practice import PracticeAttempt
+from models.activity import DailyUserActivity
+from models.leaderboard import LeaderboardChange
+from models.score import ScoreDelta
+from services.score_counters import add_score_deltas, score_totals, get_score_totals
+
+BOARDS = ('global', 'weekly', 'concept')
+
+# Seconds a missing change id is waited for before it is taken as a rollback
+COMMIT_GRACE = 30
+# Seconds between deletions of expired change rows, per process (see prune_if_due)
+PRUNE_INTERVAL = 3600
+
+class ScoreIndex:
+    """Users ranked by a positive integer score
+
+    Scores are compressed to the sorted list of distinct scores held, and a
+    Fenwick tree over their positions counts the users at each one, so a
+    user's rank and the k-th best score take O(log n) steps in the number
+    n of distinct scores. Moving users to scores not in the list yet
+    rebuilds it in O(n), once per ``update`` call. Users with no score (or
+    zero) are not ranked; ties share a rank and are listed by user id.
+    """
+
+    def __init__(self, scores=()):
+        self._scores = {}   # user id -> score
+        self._members = {}  # score -> user ids
+        for user_id, score in scores:
+            if score and score > 0:
+                self._scores[user_id] = score
+                self._members.setdefault(score, set()).add(user_id)
+        self._build()
+
+    def __len__(self):
+        return len(self._scores)
+
+    def _build(self):
+        # Scores nobody holds any more keep a zero count until the next build
+        self._values = sorted(self._members)
+        self._positions = {score: i for i, score in enumerate(self._values, 1)}
+        size = len(self._values)
+        tree = [0] * (size + 1)
+        for score, position in self._positions.items():
+            tree[position] = len(self._members[score])
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self._top_step = 1 << (size.bit_length() - 1) if size else 0
+
+    def _add(self, position, delta):
+        tree = self._tree
+        size = len(tree) - 1
+        while position <= size:
+            tree[position] += delta
+            position += position & -position
+
+    def _count_at_most(self, position):
+        tree, total = self._tree, 0
+        while position > 0:
+            total += tree[position]
+            position -= position & -position
+        return total
+
+    def _kth_lowest(self, k):
+        # Smallest score with at least k users at or below it
+        tree, position, step = self._tree, 0, self._top_step
+        size = len(tree) - 1
+        while step:
+            if position + step <= size and tree[position + step] < k:
+                position += step
+                k -= tree[position]
+            step //= 2
+        return self._values[position]
+
+    def set(self, user_id, score):
+        """Record a user's current score; zero or None removes the user"""
+        self.update(((user_id, score),))
+
+    def update(self, scores):
+        """Record several users' current scores from (user_id, score) pairs"""
+        rebuild = False
+        for user_id, score in scores:
+            score = score if score and score > 0 else 0
+            old = self._scores.get(user_id, 0)
+            if score == old:
+                continue
+            if old:
+                members = self._members[old]
+                members.discard(user_id)
+                if not members:
+                    del self._members[old]
+                del self._scores[user_id]
+                if not rebuild:
+                    self._add(self._positions[old], -1)
+            if score:
+                self._scores[user_id] = score
+                self._members.setdefault(score, set()).add(user_id)
+                position = self._positions.get(score)
+                if position is None:
+                    rebuild = True
+                elif not rebuild:
+                    self._add(position, 1)
+        if rebuild:
+            self._build()
+
+    def score(self, user_id):
+        return self._scores.get(user_id, 0)
+
+    def rank(self, user_id):
+        """1 + the number of users with a higher score, or None if unranked"""
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return len(self._scores) - self._count_at_most(self._positions[score]) + 1
+
+    def top(self, limit):
+        """The best ``limit`` (user_id, score) pairs, highest first"""
+        result = []
+        total = len(self._scores)
+        position = 1
+        while len(result) < limit and position <= total:
+            score = self._kth_lowest(total - position + 1)
+            members = self._members[score]
+            result.extend((user_id, score) for user_id in heapq.nsmallest(limit - len(result), members))
+            position += len(members)
+        return result
+
+def week_start(today=None):
+    """Monday of the current UTC week"""
+    today = today or datetime.utcnow().date()
+    return today - timedelta(days=today.weekday())
+
+def _chunks(items, size=500):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+class Leaderboards:
+    """Per-process boards, kept current from the ``leaderboard_change`` log"""
+
+    def __init__(self, app=None):
+        self.sync_interval = 5
+        self.retention = 86400
+        self._lock = threading.RLock()
+        self._reset()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.sync_interval = app.config.get('LEADERBOARD_SYNC_INTERVAL', 5)
+        self.retention = app.config.get('LEADERBOARD_CHANGE_RETENTION', 86400)
+        app.extensions['leaderboards'] = self
+
+    def _reset(self):
+        self._global = None
+        self._weekly = None
+        self._week = None
+        self._concepts = {}
+        self._last_id = 0
+        self._gaps = {}  # change id not seen yet -> when it was first missed
+        self._checked_at = float('-inf')
+        self._synced_at = float('-inf')
+
+    def expire(self):
+        """Read the change log on the next lookup instead of waiting for the interval"""
+        self._checked_at = float('-inf')
+
+    def standings(self, board, user_id, limit=10, concept_id=None):
+        """Top ``limit`` (rank, user_id, score) entries of a board plus the user's own rank and score"""
+        if board not in BOARDS:
+            raise ValueError(f'Unknown leaderboard: {board}')
+        with self._lock:
+            self._sync()
+            if board == 'global':
+                index = self._global
+            elif board == 'weekly':
+                index = self._weekly
+            else:
+                index = self._concept_board(concept_id)
+            top = []
+            for position, (entry_user, score) in enumerate(index.top(limit), 1):
+                # Tied users share the rank of the first of them
+                rank = top[-1][0] if top and top[-1][2] == score else position
+                top.append((rank, entry_user, score))
+            return {
+                'top': top,
+                'rank': index.rank(user_id),
+                'score': index.score(user_id),
+                'players': len(index),
+            }
+
+    def _sync(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.sync_interval:
+            return
+        if self._global is None or now - self._synced_at > self.retention / 2:
+            # Changes we have not seen may already be pruned
+            self._rebuild()
+        else:
+            self._apply_changes(now)
+        current_week = week_start()
+        if self._week != current_week:
+            self._weekly = ScoreIndex(db.session.execute(
+                select(DailyUserActivity.user_id, func.sum(DailyUserActivity.points))
+                .where(DailyUserActivity.day >= current_week)
+                .group_by(DailyUserActivity.user_id)
+            ))
+            self._week = current_week
+        self._checked_at = self._synced_at = now
+
+    def _rebuild(self):
+        self._reset()
+        # Read the log position first: changes committed meanwhile are applied again, harmlessly
+        self._last_id = db.session.execute(select(func.max(LeaderboardChange.id))).scalar() or 0
+        totals = score_totals().subquery()
+        self._global = ScoreIndex(db.session.execute(
+            select(totals.c.id, totals.c.total_score).where(totals.c.total_score > 0)
+        ))
+
+    def _concept_board(self, concept_id):
+        index = self._concepts.get(concept_id)
+        if index is None:
+            index = ScoreIndex(db.session.execute(
+                select(ProgressRecord.user_id, ProgressRecord.score)
+                .where(ProgressRecord.concept_id == concept_id, ProgressRecord.score > 0)
+            ))
+            self._concepts[concept_id] = index
+        return index
+
+    def _apply_changes(self, now):
+        # Ids can become visible out of order, so re-read from the oldest one still missing
+        last_id, gaps = self._last_id, self._gaps
+        floor = min(min(gaps, default=last_id + 1) - 1, last_id)
+        rows = db.session.execute(
+            select(LeaderboardChange.id, LeaderboardChange.user_id, LeaderboardChange.concept_id)
+            .where(LeaderboardChange.id > floor)
+            .order_by(LeaderboardChange.id)
+        ).all()
+        changes = [row for row in rows if row.id > last_id or row.id in gaps]
+
+        seen = {row.id for row in rows}
+        newest = max(seen, default=last_id)
+        for change_id in range(last_id + 1, newest):
+            if change_id not in seen:
+                gaps[change_id] = now
+        for change_id, missed_at in list(gaps.items()):
+            if change_id in seen or now - missed_at > COMMIT_GRACE:
+                del gaps[change_id]
+        self._last_id = max(last_id, newest)
+
+        users = {row.user_id for row in changes if row.concept_id is None}
+        for chunk in _chunks(users):
+            totals = get_score_totals(chunk)
+            self._global.update((user_id, totals.get(user_id, (0, 0))[0]) for user_id in chunk)
+            if self._week == week_start():
+                weekly = dict(db.session.execute(
+                    select(DailyUserActivity.user_id, func.sum(DailyUserActivity.points))
+                    .where(DailyUserActivity.user_id.in_(chunk), DailyUserActivity.day >= self._week)
+                    .group_by(DailyUserActivity.user_id)
+                ).all())
+                self._weekly.update((user_id, weekly.get(user_id)) for user_id in chunk)
+
+        pairs = {(row.user_id, row.concept_id) for row in changes if row.concept_id in self._concepts}
+        for chunk in _chunks(pairs):
+            scores = {(r.user_id, r.concept_id): r.score for r in db.session.execute(
+                select(ProgressRecord.user_id, ProgressRecord.concept_id, ProgressRecord.score)
+                .where(tuple_(ProgressRecord.user_id, ProgressRecord.concept_id).in_(chunk))
+            )}
+            by_concept = {}
+            for user_id, concept_id in chunk:
+                by_concept.setdefault(concept_id, []).append((user_id, scores.get((user_id, concept_id))))
+            for concept_id, updates in by_concept.items():
+                self._concepts[concept_id].update(updates)
+
+leaderboards = Leaderboards()
+
+def _record_changes(rows):
+    if not rows:
+        return
+    db.session.execute(insert(LeaderboardChange.__table__), rows)
+    db.session.info['leaderboard_changed'] = True
+
+def prune_changes():
+    """Delete change rows older than ``LEADERBOARD_CHANGE_RETENTION``; returns the number deleted"""
+    cutoff = datetime.utcnow() - timedelta(seconds=leaderboards.retention)
+    deleted = db.session.execute(
+        delete(LeaderboardChange.__table__).where(LeaderboardChange.created_at < cutoff)
+    ).rowcount
+    db.session.commit()
+    return deleted
+
+_prune_lock = threading.Lock()
+_pruned_at = [float('-inf')]
+
+def prune_if_due():
+    """Prune the change log if this process has not done so for ``PRUNE_INTERVAL`` seconds
+
+    Call with no transaction in progress; failures are logged and left for the next run.
+    """
+    now = time.monotonic()
+    if now - _pruned_at[0] < PRUNE_INTERVAL:
+        return
+    if not _prune_lock.acquire(blocking=False):
+        return
+    try:
+        _pruned_at[0] = now
+        prune_changes()
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception('Failed to prune the leaderboard change log')
+    finally:
+        _prune_lock.release()
+
+def record_points(points_by_user):
+    """Add graded attempt points to users' totals and their global and weekly boards
+
+    Must be called inside the transaction that records the attempts.
+    """
+    rows = [{'user_id': user_id, 'points': points} for user_id, points in points_by_user.items() if points]
+    add_score_deltas(rows)
+    _record_changes([{'user_id': row['user_id'], 'concept_id': None} for row in rows])
+
+def record_concept_score(user_id, concept_id):
+    """Mark a user's best score on a concept changed; call inside the writing transaction"""
+    _record_changes([{'user_id': user_id, 'concept_id': concept_id}])
+
+def rebuild_user_totals():
+    """Recompute ``total_score`` and ``concepts_completed`` for every user from history
+
+    Pending score deltas are discarded, as the recomputed totals include
+    them; run it while no answers are being submitted. Returns the number
+    of users updated.
+    """
+    points = select(func.coalesce(func.sum(PracticeAttempt.score), 0))\
+        .where(PracticeAttempt.user_id == User.id).scalar_subquery()
+    completed = select(func.count(ProgressRecord.id))\
+        .where(ProgressRecord.user_id == User.id, ProgressRecord.completed.is_(True)).scalar_subquery()
+    db.session.execute(delete(ScoreDelta.__table__))
+    result = db.session.execute(
+        update(User).values(total_score=points, concepts_completed=completed)
+        .execution_options(synchronize_session=False)
+    )
+    # Every process re-reads every user on its next sync
+    db.session.execute(insert(LeaderboardChange).from_select(
+        ['user_id', 'created_at'], select(User.id, literal(datetime.utcnow()))
+    ))
+    db.session.info['leaderboard_changed'] = True
+    return result.rowcount
+
+@event.listens_for(Session, 'after_commit')
+def _expire_on_commit(session):
+    if session.info.pop('leaderboard_changed', False):
+        leaderboards.expire()
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_on_rollback(session):
+    session.info.pop('leaderboard_changed', None)
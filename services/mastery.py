@@ -0,0 +1,126 @@
+"""
+Bayesian knowledge tracing for Math Quest
+
+Each graded answer updates the probability that the student has mastered
+the problem's concept, stored in ``concept_mastery``. One BKT
+step (condition on the answer, then allow for learning) maps the
+probability of *not* having mastered the concept, ``q = 1 - mastery``,
+to ``n*q / (a + b*q)``. Such maps compose, so any number of answers (a
+whole quiz) folds into three numbers in constant time per answer and is
+applied with a single ``INSERT ... ON CONFLICT DO UPDATE`` that reads the
+stored estimate inside the statement. Concurrent submissions therefore
+cannot lose updates. Working with ``q`` keeps full mastery (``q = 0``)
+exact, which a fold over ``mastery`` itself would lose to rounding.
+"""
+
+from datetime import datetime
+
+from app import db
+from models.practice import PracticeAttempt, PracticeProblem
+from models.mastery import ConceptMastery
+from services.upsert import dialect_insert
+
+P_INITIAL = 0.3   # Prior probability the concept is already known
+P_LEARN = 0.1     # Chance of learning the concept on each answer
+P_SLIP = 0.1      # Chance of a wrong answer despite mastery
+P_GUESS = 0.2     # Chance of a right answer without mastery
+MASTERY_THRESHOLD = 0.95
+
+def _step(correct):
+    """Coefficients (n, a, b) of one observe-then-learn BKT step on q"""
+    if correct:
+        n, a, b = P_GUESS, 1 - P_SLIP, P_GUESS + P_SLIP - 1
+    else:
+        n, a, b = 1 - P_GUESS, P_SLIP, 1 - P_GUESS - P_SLIP
+    return ((1 - P_LEARN) * n, a, b)
+
+_CORRECT_STEP = _step(True)
+_WRONG_STEP = _step(False)
+
+def fold_answers(outcomes):
+    """Compose the BKT steps for a sequence of answers into (n, a, b)"""
+    n, a, b = 1.0, 1.0, 0.0
+    for correct in outcomes:
+        sn, sa, sb = _CORRECT_STEP if correct else _WRONG_STEP
+        n, a, b = sn * n, sa * a, sa * b + sb * n
+        # The map is unchanged by scaling; keep the numbers in range
+        scale = max(n, a, abs(b))
+        n, a, b = n / scale, a / scale, b / scale
+    return n, a, b
+
+def apply_answers(mastery, outcomes):
+    """Mastery after a sequence of answers, starting from ``mastery``"""
+    n, a, b = fold_answers(outcomes)
+    q = 1 - (P_INITIAL if mastery is None else mastery)
+    return 1 - n * q / (a + b * q)
+
+def record_mastery(user_id, concept_id, outcomes):
+    """Update a student's mastery of a concept from graded answers (True = correct)
+
+    Runs in the caller's transaction; callers commit.
+    """
+    outcomes = list(outcomes)
+    if not outcomes:
+        return None
+    n, a, b = fold_answers(outcomes)
+    table = ConceptMastery.__table__
+    q = 1 - table.c.mastery
+
+    stmt = dialect_insert(ConceptMastery).values(
+        user_id=user_id, concept_id=concept_id, updated_at=datetime.utcnow(),
+        mastery=apply_answers(None, outcomes), attempts=len(outcomes)
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['user_id', 'concept_id'],
+        set_={
+            'mastery': 1 - q * n / (q * b + a),
+            'attempts': table.c.attempts + stmt.excluded.attempts,
+            'updated_at': stmt.excluded.updated_at,
+        }
+    )
+    return db.session.execute(stmt.returning(
+        ConceptMastery.concept_id, ConceptMastery.mastery, ConceptMastery.attempts
+    )).one()
+
+def rebuild_mastery(user_id=None):
+    """Recompute mastery from the full attempt history, oldest answer first
+
+    Only needed once for history recorded before mastery tracking; returns
+    the number of (user, concept) estimates written.
+    """
+    query = db.session.query(
+        PracticeAttempt.user_id, PracticeProblem.concept_id, PracticeAttempt.is_correct
+    ).join(PracticeProblem, PracticeProblem.id == PracticeAttempt.problem_id)
+    if user_id is not None:
+        query = query.filter(PracticeAttempt.user_id == user_id)
+    rows = query.order_by(
+        PracticeAttempt.user_id, PracticeProblem.concept_id, PracticeAttempt.completed_at, PracticeAttempt.id
+    ).yield_per(10000)
+
+    now = datetime.utcnow()
+    estimates = []
+    key, outcomes = None, []
+    for row in rows:
+        if (row.user_id, row.concept_id) != key:
+            if key is not None:
+                estimates.append(_estimate_row(key, outcomes, now))
+            key, outcomes = (row.user_id, row.concept_id), []
+        outcomes.append(row.is_correct)
+    if key is not None:
+        estimates.append(_estimate_row(key, outcomes, now))
+
+    if estimates:
+        stmt = dialect_insert(ConceptMastery)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['user_id', 'concept_id'],
+            set_={name: stmt.excluded[name] for name in ('mastery', 'attempts', 'updated_at')}
+        )
+        db.session.execute(stmt, estimates)
+    return len(estimates)
+
+def _estimate_row(key, outcomes, now):
+    user_id, concept_id = key
+    return {
+        'user_id': user_id, 'concept_id': concept_id, 'updated_at': now,
+        'mastery': apply_answers(None, outcomes), 'attempts': len(outcomes)
+    }
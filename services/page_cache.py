@@ -0,0 +1,100 @@
+"""
+Full-page cache for anonymous guest pages
+
+Guest pages render the same HTML for every anonymous visitor, so
+``cache_guest_page`` keeps the rendered body per path for the current
+content version and serves it with a strong ETag, Last-Modified and
+public ``Cache-Control`` headers a CDN can use. Conditional requests are
+answered with 304. Signed-in visitors and requests with pending flash
+messages are rendered normally and marked private, since the navigation
+bar differs for them.
+"""
+
+import hashlib
+import threading
+from collections import namedtuple
+from datetime import datetime
+from functools import wraps
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+
+from app import db
+from models.content import ContentVersion
+from services.content import get_content_version
+
+class CachedPage(namedtuple('CachedPage', 'body mimetype etag last_modified')):
+    """Rendered page body with its validators"""
+    __slots__ = ()
+
+    def to_response(self):
+        response = current_app.response_class(self.body, mimetype=self.mimetype)
+        response.set_etag(self.etag)
+        response.last_modified = self.last_modified
+        response.cache_control.public = True
+        response.cache_control.max_age = current_app.config.get('GUEST_PAGE_MAX_AGE', 60)
+        response.cache_control.s_maxage = current_app.config.get('GUEST_PAGE_SHARED_MAX_AGE', 300)
+        response.vary.add('Cookie')
+        return response.make_conditional(request)
+
+class PageCache:
+    """Rendered pages by path, dropped whenever the content version changes"""
+
+    def __init__(self):
+        self._pages = {}
+        self._version = None
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def get(self, path, version):
+        with self._lock:
+            if version != self._version:
+                self._pages = {}
+                self._version = version
+            page = self._pages.get(path)
+            self.stats['hits' if page is not None else 'misses'] += 1
+            return page
+
+    def put(self, path, version, response):
+        body = response.get_data()
+        page = CachedPage(body, response.mimetype, hashlib.sha256(body).hexdigest()[:32],
+                          _last_modified())
+        with self._lock:
+            if version == self._version:
+                self._pages[path] = page
+        return page
+
+    def clear(self):
+        with self._lock:
+            self._pages = {}
+            self._version = None
+
+page_cache = PageCache()
+
+# Templates and code can change with a deploy while the content does not
+_process_started_at = datetime.utcnow()
+
+def _last_modified():
+    """The later of the last content change and this process's start"""
+    row = db.session.get(ContentVersion, 1)
+    content_changed_at = row.updated_at if row is not None and row.updated_at else _process_started_at
+    return max(content_changed_at, _process_started_at).replace(microsecond=0)
+
+def cache_guest_page(view):
+    """Serve a guest view from the page cache for anonymous visitors"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if current_user.is_authenticated or '_flashes' in session:
+            response = make_response(view(*args, **kwargs))
+            response.cache_control.private = True
+            response.vary.add('Cookie')
+            return response
+
+        version = get_content_version()
+        page = page_cache.get(request.path, version)
+        if page is None:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or session.modified:
+                return response
+            page = page_cache.put(request.path, version, response)
+        return page.to_response()
+    return wrapper
@@ -0,0 +1,118 @@
+"""
+Read-only practice problem views for rendering
+
+Practice pages only need a problem's display fields, so problems are
+turned into immutable ``ProblemView`` tuples once per content version,
+with multiple choice options already decoded. Requests share the same
+objects instead of loading ORM instances and parsing ``options`` on
+every render.
+
+Each concept's problems are also pooled by difficulty, so quizzes can be
+drawn at random or to a target difficulty mix in time proportional to
+the quiz size rather than the size of the problem bank.
+"""
+
+import json
+import random
+from collections import namedtuple
+
+from app import db
+from models.practice import PracticeProblem
+from services.content import VersionedCache
+
+class ProblemView(namedtuple('ProblemView', 'id concept_id question problem_type options difficulty points time_limit explanation')):
+    """Display fields of a practice problem, with options as a tuple"""
+    __slots__ = ()
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a view from a PracticeProblem instance or a row with the same columns"""
+        return cls(
+            row.id, row.concept_id, row.question, row.problem_type,
+            tuple(json.loads(row.options)) if row.options else (),
+            row.difficulty or 1,
+            row.points if row.points is not None else 10,
+            row.time_limit if row.time_limit is not None else 120,
+            row.explanation or None
+        )
+
+class ProblemIndex:
+    """Problem views by id, by concept and by concept and difficulty, in id order"""
+
+    def __init__(self, views):
+        self.by_id = {}
+        by_concept = {}
+        pools = {}
+        for view in sorted(views, key=lambda v: v.id):
+            self.by_id[view.id] = view
+            by_concept.setdefault(view.concept_id, []).append(view)
+            pools.setdefault(view.concept_id, {}).setdefault(view.difficulty, []).append(view)
+        self.by_concept = {concept_id: tuple(views) for concept_id, views in by_concept.items()}
+        self.pools = {
+            concept_id: {difficulty: tuple(views) for difficulty, views in buckets.items()}
+            for concept_id, buckets in pools.items()
+        }
+
+    def problem(self, problem_id):
+        return self.by_id.get(problem_id)
+
+    def problems(self, concept_id, limit=None):
+        views = self.by_concept.get(concept_id, ())
+        return list(views if limit is None else views[:limit])
+
+    def draw(self, concept_id, count, mix=None, rng=random):
+        """Pick up to ``count`` distinct problems of a concept in random order
+
+        ``mix`` optionally maps difficulty to a relative weight, e.g.
+        ``{1: 3, 2: 5, 3: 2}``. Buckets that run short are topped up with
+        other problems of the concept.
+        """
+        views = self.by_concept.get(concept_id, ())
+        if count >= len(views):
+            picked = list(views)
+            rng.shuffle(picked)
+            return picked
+
+        buckets = self.pools.get(concept_id, {})
+        weights = {d: w for d, w in (mix or {}).items() if w > 0 and d in buckets}
+        if not weights:
+            return rng.sample(views, count)
+
+        picked = []
+        for difficulty, quota in _allocate(count, weights).items():
+            bucket = buckets[difficulty]
+            picked.extend(rng.sample(bucket, min(quota, len(bucket))))
+
+        # Fill any shortfall by rejection sampling, since count < len(views)
+        chosen = {view.id for view in picked}
+        while len(picked) < count:
+            view = rng.choice(views)
+            if view.id not in chosen:
+                chosen.add(view.id)
+                picked.append(view)
+        rng.shuffle(picked)
+        return picked
+
+def _allocate(count, weights):
+    """Split ``count`` across keys in proportion to weights (largest remainder)"""
+    total = sum(weights.values())
+    exact = {key: count * weight / total for key, weight in weights.items()}
+    quotas = {key: int(value) for key, value in exact.items()}
+    leftover = count - sum(quotas.values())
+    for key in sorted(exact, key=lambda k: exact[k] - quotas[k], reverse=True)[:leftover]:
+        quotas[key] += 1
+    return quotas
+
+def _load_problem_index():
+    rows = db.session.query(
+        PracticeProblem.id, PracticeProblem.concept_id, PracticeProblem.question,
+        PracticeProblem.problem_type, PracticeProblem.options, PracticeProblem.difficulty,
+        PracticeProblem.points, PracticeProblem.time_limit, PracticeProblem.explanation
+    ).all()
+    return ProblemIndex(ProblemView.from_row(row) for row in rows)
+
+_index_cache = VersionedCache(_load_problem_index)
+
+def get_problem_index():
+    """Return the process-wide problem index for the current content version"""
+    return _index_cache.get()
@@ -0,0 +1,102 @@
+"""
+Progress recording for Math Quest
+
+Each progress write is one ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING``
+on the (user_id, concept_id) unique index, with the best-score,
+attempt-count and completion rules expressed in SQL. Concurrent requests (e.g. a double-click) can neither
+race nor create duplicate records. The follow-up bookkeeping (completion
+bitmap and count, daily activity, chart version, leaderboard, achievements)
+runs in the same transaction; callers commit.
+"""
+
+from datetime import datetime
+from sqlalchemy import case, and_, not_
+
+from app import db
+from models.progress import ProgressRecord
+from services.activity import record_activity
+from services.achievements import handle_events, CONCEPT_COMPLETED, SCORE_CHANGED
+from services.score_series import record_progress_change
+from services.leaderboard import record_concept_score
+from services.score_counters import add_score_deltas
+from services.upsert import dialect_insert
+
+COMPLETION_SCORE = 80
+
+_RETURNING = (ProgressRecord.id, ProgressRecord.concept_id, ProgressRecord.score,
+              ProgressRecord.attempts, ProgressRecord.completed, ProgressRecord.completed_at,
+              ProgressRecord.last_attempt)
+
+def _upsert(values, set_):
+    stmt = dialect_insert(ProgressRecord).values(**values)
+    stmt = stmt.on_conflict_do_update(index_elements=['user_id', 'concept_id'], set_=set_(stmt.excluded))
+    return db.session.execute(stmt.returning(*_RETURNING)).one()
+
+def record_progress_attempt(user, concept_id, score, time_spent):
+    """Apply a progress attempt: count it, keep the best score and complete at 80+"""
+    now = datetime.utcnow()
+    completes = score >= COMPLETION_SCORE
+    table = ProgressRecord.__table__
+    
+    state = _upsert(
+        {
+            'user_id': user.id, 'concept_id': concept_id,
+            'score': score, 'attempts': 1, 'time_spent': time_spent,
+            'completed': completes, 'completed_at': now if completes else None,
+            'first_attempt': now, 'last_attempt': now
+        },
+        lambda excluded: {
+            'attempts': table.c.attempts + 1,
+            'score': case((excluded.score > table.c.score, excluded.score), else_=table.c.score),
+            'time_spent': table.c.time_spent + excluded.time_spent,
+            'last_attempt': excluded.last_attempt,
+            'completed': table.c.completed | excluded.completed,
+            'completed_at': case(
+                (and_(not_(table.c.completed), excluded.completed), excluded.completed_at),
+                else_=table.c.completed_at
+            ),
+        }
+    )
+    # completed_at only equals this request's timestamp if this write completed the concept
+    newly_completed = bool(state.completed) and state.completed_at == now
+    _after_progress_write(user, state, newly_completed, score_changed=state.score == score,
+                          time_spent=time_spent)
+    return state
+
+def record_concept_completion(user, concept_id):
+    """Mark a concept complete with a full score"""
+    now = datetime.utcnow()
+    table = ProgressRecord.__table__
+    
+    state = _upsert(
+        {
+            'user_id': user.id, 'concept_id': concept_id,
+            'score': 100, 'attempts': 0, 'time_spent': 0,
+            'completed': True, 'completed_at': now,
+            'first_attempt': now, 'last_attempt': now
+        },
+        lambda excluded: {
+            'score': excluded.score,
+            'completed': True,
+            'completed_at': case((table.c.completed, table.c.completed_at), else_=excluded.completed_at),
+        }
+    )
+    newly_completed = state.completed_at == now
+    _after_progress_write(user, state, newly_completed, score_changed=True)
+    return state
+
+def _after_progress_write(user, state, newly_completed, score_changed, time_spent=0):
+    if newly_completed:
+        user.set_concept_completed(state.concept_id)
+        add_score_deltas([{'user_id': user.id, 'concepts_completed': 1}])
+    record_activity(user.id, time_spent=time_spent, concepts_completed=1 if newly_completed else 0)
+    record_progress_change(user.id, state)
+    if score_changed:
+        record_concept_score(user.id, state.concept_id)
+    
+    events = set()
+    if newly_completed:
+        events.add(CONCEPT_COMPLETED)
+    if score_changed:
+        events.add(SCORE_CHANGED)
+    handle_events(user, events)
@@ -0,0 +1,114 @@
+"""
+Spaced-repetition review scheduling for Math Quest
+
+Every graded answer reschedules the problem for that student with the
+SM-2 algorithm: correct answers push the next review further out, wrong
+ones bring it back to tomorrow. The schedule lives in ``review_item``,
+indexed on (user_id, due_at), so fetching a student's next due reviews
+is one index range scan however many problems they have reviewed.
+"""
+
+from datetime import datetime, timedelta
+from sqlalchemy import func
+
+from app import db
+from models.review import ReviewItem
+from services.upsert import dialect_insert
+
+REVIEW_BATCH_SIZE = 20
+FAST_ANSWER_SECONDS = 30
+MIN_EASE = 1.3
+INITIAL_EASE = 2.5
+SCHEDULE_COLUMNS = ('due_at', 'interval_days', 'ease', 'repetitions', 'lapses', 'last_reviewed_at')
+
+def answer_quality(is_correct, time_taken):
+    """SM-2 quality (0-5) of an answer: 5 quick and right, 4 right, 1 wrong"""
+    if not is_correct:
+        return 1
+    return 5 if (time_taken or 0) <= FAST_ANSWER_SECONDS else 4
+
+def next_schedule(state, quality, now):
+    """Return the SM-2 state after an answer of the given quality
+
+    ``state`` holds the current ``interval_days``, ``ease``, ``repetitions``
+    and ``lapses``, or is None for a problem never reviewed before.
+    """
+    interval = state['interval_days'] if state else 0
+    ease = state['ease'] if state else INITIAL_EASE
+    repetitions = state['repetitions'] if state else 0
+    lapses = state['lapses'] if state else 0
+
+    if quality >= 3:
+        if repetitions == 0:
+            interval = 1
+        elif repetitions == 1:
+            interval = 6
+        else:
+            interval = interval * ease
+        repetitions += 1
+    else:
+        interval = 1
+        repetitions = 0
+        lapses += 1 if state else 0
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+
+    return {
+        'due_at': now + timedelta(days=interval),
+        'interval_days': interval,
+        'ease': ease,
+        'repetitions': repetitions,
+        'lapses': lapses,
+        'last_reviewed_at': now,
+    }
+
+def schedule_reviews(user_id, answers, now=None):
+    """Reschedule reviewed problems from (problem_id, is_correct, time_taken) answers
+
+    Reads the current schedule of the answered problems with one query and
+    writes them back with one upsert, in the caller's transaction.
+    """
+    if not answers:
+        return 0
+    now = now or datetime.utcnow()
+    problem_ids = {problem_id for problem_id, _, _ in answers}
+    schedules = {
+        row.problem_id: row._asdict()
+        for row in db.session.query(
+            ReviewItem.problem_id, ReviewItem.interval_days, ReviewItem.ease,
+            ReviewItem.repetitions, ReviewItem.lapses
+        ).filter(
+            ReviewItem.user_id == user_id, ReviewItem.problem_id.in_(problem_ids)
+        ).with_for_update()
+    }
+
+    # Answers are applied in order, so a problem answered twice moves twice
+    for problem_id, is_correct, time_taken in answers:
+        schedules[problem_id] = next_schedule(
+            schedules.get(problem_id), answer_quality(is_correct, time_taken), now
+        )
+
+    rows = [
+        dict(schedules[problem_id], user_id=user_id, problem_id=problem_id)
+        for problem_id in problem_ids
+    ]
+    stmt = dialect_insert(ReviewItem)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['user_id', 'problem_id'],
+        set_={column: stmt.excluded[column] for column in SCHEDULE_COLUMNS}
+    )
+    db.session.execute(stmt, rows)
+    return len(rows)
+
+def due_reviews(user_id, limit=REVIEW_BATCH_SIZE, now=None):
+    """The user's due review problem ids, most overdue first"""
+    now = now or datetime.utcnow()
+    return [problem_id for (problem_id,) in db.session.query(ReviewItem.problem_id)
+            .filter(ReviewItem.user_id == user_id, ReviewItem.due_at <= now)
+            .order_by(ReviewItem.due_at)
+            .limit(limit)]
+
+def count_due_reviews(user_id, now=None):
+    """How many of the user's reviews are due"""
+    now = now or datetime.utcnow()
+    return db.session.query(func.count())\
+        .filter(ReviewItem.user_id == user_id, ReviewItem.due_at <= now).scalar()
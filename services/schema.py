@@ -0,0 +1,83 @@
+"""
+Additive schema upgrades for Math Quest
+
+``db.create_all()`` only creates missing tables, so columns and indexes
+added to existing models are applied here. New columns must be nullable
+or carry a server default.
+"""
+
+from sqlalchemy import inspect, text, func
+
+from app import db
+from models.progress import ProgressRecord
+
+def upgrade_schema():
+    """Add any model columns missing from existing tables"""
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    preparer = db.engine.dialect.identifier_preparer
+    added = []
+
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {c['name'] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                ddl = 'ALTER TABLE {} ADD COLUMN {} {}'.format(
+                    preparer.format_table(table),
+                    preparer.format_column(column),
+                    column.type.compile(dialect=db.engine.dialect),
+                )
+                if column.server_default is not None:
+                    ddl += ' DEFAULT {}'.format(column.server_default.arg)
+                connection.execute(text(ddl))
+                added.append(f'{table.name}.{column.name}')
+
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_indexes = {ix['name'] for ix in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name in existing_indexes:
+                    continue
+                if index.name == 'uq_progress_record_user_concept':
+                    _merge_duplicate_progress(connection)
+                index.create(connection)
+                added.append(index.name)
+    return added
+
+def _merge_duplicate_progress(connection):
+    """Keep one progress record per user and concept before adding the unique index
+
+    The surviving record takes the best score and earliest completion;
+    attempts and time are summed into it.
+    """
+    table = ProgressRecord.__table__
+    duplicates = connection.execute(
+        db.select(table.c.user_id, table.c.concept_id)
+        .group_by(table.c.user_id, table.c.concept_id)
+        .having(func.count() > 1)
+    ).all()
+    for user_id, concept_id in duplicates:
+        rows = connection.execute(
+            db.select(table).where(table.c.user_id == user_id, table.c.concept_id == concept_id)
+            .order_by(table.c.id)
+        ).all()
+        keep, extra = rows[0], rows[1:]
+        completed_at = [r.completed_at for r in rows if r.completed and r.completed_at]
+        connection.execute(
+            table.update().where(table.c.id == keep.id).values(
+                score=max(r.score or 0 for r in rows),
+                completed=any(r.completed for r in rows),
+                completed_at=min(completed_at, default=keep.completed_at),
+                attempts=sum(r.attempts or 0 for r in rows),
+                time_spent=sum(r.time_spent or 0 for r in rows),
+                first_attempt=min((r.first_attempt for r in rows if r.first_attempt), default=None),
+                last_attempt=max((r.last_attempt for r in rows if r.last_attempt), default=None)
+            )
+        )
+        connection.execute(table.delete().where(table.c.id.in_([r.id for r in extra])))
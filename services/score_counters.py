@@ -0,0 +1,117 @@
+"""
+Score counters for Math Quest
+
+``User.total_score`` and ``User.concepts_completed`` are not updated by the
+requests that earn points: that would lock the user row on every answer
+and serialise a student's concurrent submissions. Writers append a
+``score_delta`` row instead, which touches no shared row, so graded
+answers do not write the user row at all. Progress writes still do, once
+per progress update or completion rather than per answer: they bump
+``progress_version`` and set the completed concept's bit. Pending deltas
+are folded into the user rows in batches at most once per
+``SCORE_FOLD_INTERVAL`` seconds per process (or by ``flask fold-scores``),
+and reads add the folded value and the pending deltas in one statement,
+so a total is the same on either side of a fold.
+"""
+
+import threading
+import time
+from flask import current_app
+from sqlalchemy import select, insert, update, delete, func, bindparam
+
+from app import db
+from models.user import User
+from models.score import ScoreDelta
+
+FOLD_BATCH_SIZE = 10000
+
+def add_score_deltas(rows):
+    """Append counter deltas (dicts of user_id plus points and/or concepts_completed)
+
+    Must be called inside the transaction that earned them.
+    """
+    rows = [{'user_id': row['user_id'], 'points': row.get('points', 0),
+             'concepts_completed': row.get('concepts_completed', 0)}
+            for row in rows if row.get('points') or row.get('concepts_completed')]
+    if rows:
+        db.session.execute(insert(ScoreDelta.__table__), rows)
+
+def score_totals():
+    """Select of (id, total_score, concepts_completed) per user, pending deltas included"""
+    pending = select(
+        ScoreDelta.user_id,
+        func.sum(ScoreDelta.points).label('points'),
+        func.sum(ScoreDelta.concepts_completed).label('concepts_completed')
+    ).group_by(ScoreDelta.user_id).subquery()
+    return select(
+        User.id,
+        (func.coalesce(User.total_score, 0) + func.coalesce(pending.c.points, 0)).label('total_score'),
+        (func.coalesce(User.concepts_completed, 0)
+         + func.coalesce(pending.c.concepts_completed, 0)).label('concepts_completed')
+    ).outerjoin(pending, pending.c.user_id == User.id)
+
+def get_score_totals(user_ids):
+    """{user id: (total_score, concepts_completed)} for the given users"""
+    rows = db.session.execute(score_totals().where(User.id.in_(list(user_ids))))
+    return {row.id: (row.total_score, row.concepts_completed) for row in rows}
+
+def fold_score_deltas(batch_size=FOLD_BATCH_SIZE):
+    """Add pending deltas to the user rows and delete them; returns the number folded
+
+    Each batch deletes deltas with RETURNING and adds exactly the returned
+    values in the same transaction, so a delta committed mid-fold is either
+    in this batch or left for the next one. Commits after each batch.
+    """
+    table = ScoreDelta.__table__
+    user_table = User.__table__
+    folded = 0
+    while True:
+        deleted = db.session.execute(
+            delete(table)
+            .where(table.c.id.in_(select(table.c.id).order_by(table.c.id).limit(batch_size)))
+            .returning(table.c.user_id, table.c.points, table.c.concepts_completed)
+        ).all()
+        if not deleted:
+            db.session.commit()
+            return folded
+
+        totals = {}
+        for user_id, points, completed in deleted:
+            bucket = totals.setdefault(user_id, [0, 0])
+            bucket[0] += points
+            bucket[1] += completed
+        # Fixed lock order, so concurrent folds cannot deadlock
+        db.session.execute(
+            update(user_table).where(user_table.c.id == bindparam('uid')).values(
+                total_score=func.coalesce(user_table.c.total_score, 0) + bindparam('points'),
+                concepts_completed=func.coalesce(user_table.c.concepts_completed, 0) + bindparam('completed')
+            ),
+            [{'uid': user_id, 'points': points, 'completed': completed}
+             for user_id, (points, completed) in sorted(totals.items())]
+        )
+        db.session.commit()
+        folded += len(deleted)
+        if len(deleted) < batch_size:
+            return folded
+
+_fold_lock = threading.Lock()
+_folded_at = [float('-inf')]
+
+def fold_if_due():
+    """Fold pending deltas if this process has not done so for ``SCORE_FOLD_INTERVAL`` seconds
+
+    Call with no transaction in progress; failures are logged and left for the next run.
+    """
+    now = time.monotonic()
+    if now - _folded_at[0] < current_app.config.get('SCORE_FOLD_INTERVAL', 60):
+        return
+    if not _fold_lock.acquire(blocking=False):
+        return
+    try:
+        _folded_at[0] = now
+        fold_score_deltas()
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception('Failed to fold score deltas')
+    finally:
+        _fold_lock.release()
@@ -0,0 +1,131 @@
+"""
+Cached cumulative-score series for the progress chart
+
+Each user's series (progress records ordered by last attempt, with a
+running total of best scores) is kept in a bounded per-process LRU cache
+and tagged with ``User.progress_version``. Progress writes bump that
+version in the same transaction and swap in a patched copy of the cached
+series after commit, so polling the chart endpoint is a version
+comparison on the already loaded user row.
+"""
+
+import bisect
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from sqlalchemy import update, event
+from sqlalchemy.orm import Session
+
+from app import db
+from models.user import User
+from models.progress import ProgressRecord
+
+MAX_CACHED_USERS = 10000
+
+class ScoreSeries:
+    """Progress entries in last-attempt order with running totals
+
+    Never changed after construction: requests may be reading a series
+    while a commit replaces it, so updates build a new one.
+    """
+
+    def __init__(self, version, entries):
+        self.version = version
+        self.entries = tuple(entries)  # (concept_id, last_attempt, score)
+        totals, running = [], 0
+        for _, _, score in self.entries:
+            running += score
+            totals.append(running)
+        self.totals = tuple(totals)
+
+    def applied(self, version, concept_id, last_attempt, score):
+        """A copy with a concept's entry replaced, keeping entries ordered by last attempt"""
+        entries = [entry for entry in self.entries if entry[0] != concept_id]
+        index = bisect.bisect_right([entry[1] for entry in entries], last_attempt)
+        entries.insert(index, (concept_id, last_attempt, score or 0))
+        return ScoreSeries(version, entries)
+
+    def points(self, concept_names, start=None, end=None, bucket=None):
+        """Chart points, optionally limited to a date range and reduced to the last point per bucket"""
+        points = []
+        last_key = None
+        for (concept_id, last_attempt, _), total in zip(self.entries, self.totals):
+            day = last_attempt.date()
+            if (start and day < start) or (end and day > end):
+                continue
+            point = {
+                'date': day.strftime('%Y-%m-%d'),
+                'score': total,
+                'concept': concept_names.get(concept_id)
+            }
+            key = _bucket_key(day, bucket) if bucket else None
+            if bucket and points and key == last_key:
+                points[-1] = point
+            else:
+                points.append(point)
+            last_key = key
+        return points
+
+def _bucket_key(day, bucket):
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return (day.year, day.month)
+    return day
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def get_score_series(user):
+    """Return the cached series for a user, rebuilding it if it is stale"""
+    version = user.progress_version or 0
+    with _cache_lock:
+        series = _cache.get(user.id)
+        if series is not None and series.version == version:
+            _cache.move_to_end(user.id)
+            return series
+
+    rows = db.session.query(
+        ProgressRecord.concept_id, ProgressRecord.last_attempt, ProgressRecord.score
+    ).filter_by(user_id=user.id).order_by(ProgressRecord.last_attempt).all()
+    series = ScoreSeries(version, ((r.concept_id, r.last_attempt, r.score or 0) for r in rows))
+
+    with _cache_lock:
+        _cache[user.id] = series
+        _cache.move_to_end(user.id)
+        while len(_cache) > MAX_CACHED_USERS:
+            _cache.popitem(last=False)
+    return series
+
+def record_progress_change(user_id, progress):
+    """Bump the user's progress version for a changed ProgressRecord
+
+    Must be called inside the transaction that writes the record; the cached
+    series is patched once that transaction commits.
+    """
+    new_version = db.session.execute(
+        update(User).where(User.id == user_id)
+        .values(progress_version=db.func.coalesce(User.progress_version, 0) + 1)
+        .returning(User.progress_version)
+    ).scalar()
+    db.session.info.setdefault('score_series_updates', []).append(
+        (user_id, new_version, progress.concept_id, progress.last_attempt or datetime.utcnow(), progress.score)
+    )
+    return new_version
+
+@event.listens_for(Session, 'after_commit')
+def _apply_series_updates(session):
+    for user_id, version, concept_id, last_attempt, score in session.info.pop('score_series_updates', []):
+        with _cache_lock:
+            series = _cache.get(user_id)
+            if series is None:
+                continue
+            if series.version == version - 1:
+                _cache[user_id] = series.applied(version, concept_id, last_attempt, score)
+            else:
+                # Another process wrote in between; rebuild on next read
+                del _cache[user_id]
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_series_updates(session):
+    session.info.pop('score_series_updates', None)
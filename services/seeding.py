@@ -0,0 +1,122 @@
+"""
+Schema migration and content seeding for Math Quest
+
+Run from the ``flask`` CLI (see commands.py) or the Gunicorn master (see
+gunicorn.conf.py), never from each worker.
+Seeding is guarded by a hash of the content files stored on the
+``content_version`` row, so it is a single query when nothing changed.
+Migration and seeding both hold a cross-process lock so concurrently
+starting processes cannot race on DDL or seed twice.
+"""
+
+import os
+from contextlib import contextmanager
+from flask import current_app
+from sqlalchemy import text
+
+from app import db
+from models.content import ContentVersion
+from services import content_loader
+from services.schema import upgrade_schema
+
+# Arbitrary application-wide key for pg_advisory_lock
+SEED_LOCK_KEY = 7263011
+
+def migrate():
+    """Create missing tables, then add missing columns and indexes"""
+    with seed_lock():
+        db.create_all()
+        return upgrade_schema()
+
+def setup():
+    """Migrate, seed, then build the content pack if it is used; what ``flask setup`` runs
+
+    Returns (schema changes applied, whether content was seeded, pack stats or None).
+    """
+    changes = migrate()
+    seeded = seed()
+    # seed() rebuilds the pack when it loads content; the file may still be missing here
+    pack = None if seeded else build_pack_if_used()
+    return changes, seeded, pack
+
+def build_pack_if_used():
+    """Rebuild the content pack when ``CONTENT_SOURCE`` is pack; returns its stats or None"""
+    if current_app.config.get('CONTENT_SOURCE') != 'pack':
+        return None
+    from services.content_pack import build_pack
+    from services.content_provider import content_provider
+    return build_pack(content_provider.pack_path)
+
+def content_hash():
+    """SHA-256 of the curriculum content files"""
+    return content_loader.content_hash()
+
+def stored_content_hash():
+    row = db.session.get(ContentVersion, 1)
+    return row.content_hash if row else None
+
+@contextmanager
+def seed_lock():
+    """Hold an exclusive cross-process lock for the duration of seeding"""
+    if db.engine.dialect.name == 'postgresql':
+        with db.engine.connect() as connection:
+            connection.execute(text('SELECT pg_advisory_lock(:key)'), {'key': SEED_LOCK_KEY})
+            try:
+                yield
+            finally:
+                connection.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': SEED_LOCK_KEY})
+                connection.commit()
+        return
+
+    os.makedirs(current_app.instance_path, exist_ok=True)
+    with open(os.path.join(current_app.instance_path, 'seed.lock'), 'a+') as lock_file:
+        _lock_file(lock_file)
+        try:
+            yield
+        finally:
+            _unlock_file(lock_file)
+
+def _lock_file(lock_file):
+    try:
+        import fcntl
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+    except ImportError:
+        import msvcrt
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+
+def _unlock_file(lock_file):
+    try:
+        import fcntl
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+    except ImportError:
+        import msvcrt
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def seed(force=False):
+    """Load curriculum content unless it is unchanged; returns True if it ran
+
+    With ``CONTENT_SOURCE=pack`` the pack is rebuilt too, so pages never show
+    problems that grading (which reads the database) no longer has.
+    """
+    current_hash = content_hash()
+    if not force and stored_content_hash() == current_hash:
+        return False
+
+    with seed_lock():
+        # Another process may have finished seeding while we waited
+        db.session.rollback()
+        if not force and stored_content_hash() == current_hash:
+            return False
+
+        content_loader.load_content()
+
+        row = db.session.get(ContentVersion, 1)
+        if row is None:
+            row = ContentVersion(id=1, version=0)
+            db.session.add(row)
+        row.content_hash = current_hash
+        db.session.commit()
+        build_pack_if_used()
+    return True
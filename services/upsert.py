@@ -0,0 +1,19 @@
+"""
+Dialect-specific INSERT ... ON CONFLICT support
+
+SQLite and PostgreSQL share the ``on_conflict_do_update`` API, so callers
+build one statement and get a single atomic round trip on either backend.
+"""
+
+from app import db
+
+def dialect_insert(model):
+    """Return an insert() for the session's dialect that supports ON CONFLICT"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f'ON CONFLICT upserts are not supported on {dialect}')
+    return insert(model)
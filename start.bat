@@ -24,11 +24,9 @@ REM Install dependencies
 echo 📚 Installing dependencies...
 pip install -r requirements.txt
 
-REM Check if database exists, if not seed it
-if not exist "math_game.db" (
-    echo 🌱 Seeding database with initial data...
-    python seed_data.py
-)
+REM Create tables and seed content (no-op when already up to date)
+echo 🌱 Preparing database...
+flask --app app:create_app setup
 
 REM Start the application
 echo 🌟 Starting the application...
@@ -23,11 +23,9 @@ source venv/bin/activate
 echo "📚 Installing dependencies..."
 pip install -r requirements.txt
 
-# Check if database exists, if not seed it
-if [ ! -f "math_game.db" ]; then
-    echo "🌱 Seeding database with initial data..."
-    python seed_data.py
-fi
+# Create tables and seed content (no-op when already up to date)
+echo "🌱 Preparing database..."
+flask --app app:create_app setup
 
 # Start the application
 echo "🌟 Starting the application..."
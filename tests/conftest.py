@@ -0,0 +1,69 @@
+"""
+Shared fixtures: one migrated and seeded database per test session
+
+Tests run against a fresh SQLite file unless ``TEST_DATABASE_URL`` names
+another database (e.g. a scratch PostgreSQL one).
+"""
+
+import itertools
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_usernames = itertools.count(1)
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('instance')
+    os.environ['FLASK_ENV'] = 'testing'
+    os.environ['DATABASE_URL'] = (os.environ.get('TEST_DATABASE_URL')
+                                  or 'sqlite:///' + str(directory / 'test.db'))
+
+    from app import create_app, db
+    from services.seeding import migrate, seed
+
+    app = create_app()
+    app.config['WTF_CSRF_ENABLED'] = False
+    app.instance_path = str(directory)
+    with app.app_context():
+        migrate()
+        seed()
+        db.session.remove()
+    yield app
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def register(client, username=None):
+    """Register and log in a new user; returns the username"""
+    username = username or f'student{os.getpid()}x{next(_usernames)}'
+    client.post('/auth/register', data={
+        'username': username, 'email': f'{username}@example.com',
+        'password': 'secret1', 'confirm_password': 'secret1',
+    })
+    response = client.post('/auth/login', data={'username': username, 'password': 'secret1'})
+    assert response.status_code == 302, response.data[:500]
+    return username
+
+@pytest.fixture
+def student(client):
+    """A test client logged in as a fresh user"""
+    register(client)
+    return client
+
+def write_concept(directory, slug, order, problems, **fields):
+    """Write a content file for one concept; problems are (key, question, answer) triples"""
+    doc = {
+        'slug': slug, 'name': slug.replace('-', ' ').title(), 'description': f'About {slug}',
+        'category': 'Test', 'order_in_curriculum': order, 'lesson_content': f'<p>{slug}</p>',
+        'problems': [{'key': key, 'question': question, 'problem_type': 'fill_blank', 'correct_answer': answer}
+                     for key, question, answer in problems],
+    }
+    doc.update(fields)
+    with open(os.path.join(directory, f'{slug}.json'), 'w', encoding='utf-8') as f:
+        json.dump(doc, f)
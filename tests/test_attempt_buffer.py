@@ -0,0 +1,125 @@
+"""
+The attempt write-behind buffer: back-pressure, failed batches and shutdown
+"""
+
+import queue
+import threading
+from datetime import datetime
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+import services.attempt_buffer as attempt_buffer_module
+from app import db
+from conftest import register
+from models.practice import PracticeAttempt
+from models.user import User
+from services.attempt_buffer import AttemptWriteBuffer
+
+QUEUE_MAX = 4
+
+@pytest.fixture
+def buffer(app):
+    """A write-behind buffer of its own, whose worker only flushes when asked"""
+    buffer = AttemptWriteBuffer()
+    buffer.app = app
+    buffer.enabled = True
+    buffer.batch_size = 100
+    buffer.flush_interval = 60
+    buffer.enqueue_timeout = 0.01
+    buffer._queue = queue.Queue()
+    buffer._slots = threading.BoundedSemaphore(QUEUE_MAX)
+    yield buffer
+    buffer.shutdown()
+
+@pytest.fixture
+def user_id(app, client):
+    username = register(client)
+    with app.app_context():
+        return User.query.filter_by(username=username).one().id
+
+def _rows(user_id, count, problem_id=1):
+    now = datetime.utcnow()
+    return [{'user_id': user_id, 'problem_id': problem_id, 'user_answer': f'a{i}', 'is_correct': True,
+             'time_taken': 5, 'score': 10, 'started_at': now, 'completed_at': now}
+            for i in range(count)]
+
+def _written(app, user_id):
+    with app.app_context():
+        answers = [answer for (answer,) in db.session.query(PracticeAttempt.user_answer)
+                   .filter_by(user_id=user_id).order_by(PracticeAttempt.id)]
+        db.session.remove()
+    return answers
+
+def _free_slots(buffer):
+    free = 0
+    while buffer._slots.acquire(blocking=False):
+        free += 1
+    buffer._release(free)
+    return free
+
+def test_full_queue_writes_the_rest_synchronously(app, buffer, user_id):
+    with app.app_context():
+        mastery = buffer.add(_rows(user_id, QUEUE_MAX + 3))
+        db.session.commit()
+        db.session.remove()
+    assert (user_id, 1) in mastery
+    assert buffer.stats['queued'] == QUEUE_MAX
+    assert buffer.stats['sync_writes'] == 3
+    assert _written(app, user_id) == [f'a{i}' for i in range(QUEUE_MAX, QUEUE_MAX + 3)]
+    assert _free_slots(buffer) == 0
+
+    assert buffer.flush() == QUEUE_MAX
+    assert (buffer.stats['written'], buffer.stats['batches']) == (QUEUE_MAX, 1)
+    assert len(_written(app, user_id)) == QUEUE_MAX + 3
+    assert _free_slots(buffer) == QUEUE_MAX
+
+def test_rejected_row_is_dropped_and_the_rest_written(app, buffer, user_id):
+    rows = _rows(user_id, 3)
+    rows[1]['problem_id'] = None
+    with app.app_context():
+        assert buffer.add(rows) == {}
+    assert buffer.flush() == 2
+    assert buffer.stats == {'queued': 3, 'written': 2, 'batches': 0, 'sync_writes': 0, 'errors': 1, 'dropped': 1}
+    assert _written(app, user_id) == ['a0', 'a2']
+    assert buffer._retry == []
+    assert _free_slots(buffer) == QUEUE_MAX
+
+def test_unavailable_database_keeps_rows_for_the_next_flush(app, buffer, user_id, monkeypatch):
+    insert_attempts = attempt_buffer_module._insert_attempts
+    calls = []
+
+    def failing_insert(rows):
+        # The batch fails, the first single row goes through, then the database goes away
+        calls.append(rows)
+        if len(calls) != 2:
+            raise OperationalError('INSERT', {}, Exception('server closed the connection'))
+        return insert_attempts(rows)
+
+    with app.app_context():
+        buffer.add(_rows(user_id, 3))
+    monkeypatch.setattr(attempt_buffer_module, '_insert_attempts', failing_insert)
+    assert buffer.flush() == 1
+    assert _written(app, user_id) == ['a0']
+    assert [row['user_answer'] for row in buffer._retry] == ['a1', 'a2']
+    assert (buffer.stats['written'], buffer.stats['dropped'], buffer.stats['errors']) == (1, 0, 1)
+    # Rows kept for retry still hold their queue slots
+    assert _free_slots(buffer) == QUEUE_MAX - 2
+
+    monkeypatch.setattr(attempt_buffer_module, '_insert_attempts', insert_attempts)
+    assert buffer.flush() == 2
+    assert _written(app, user_id) == ['a0', 'a1', 'a2']
+    assert buffer._retry == []
+    assert _free_slots(buffer) == QUEUE_MAX
+
+def test_shutdown_flushes_queued_rows(app, buffer, user_id):
+    with app.app_context():
+        buffer.add(_rows(user_id, 3))
+    assert buffer._thread.is_alive()
+    assert _written(app, user_id) == []
+
+    buffer.shutdown()
+    assert not buffer._thread.is_alive()
+    assert _written(app, user_id) == ['a0', 'a1', 'a2']
+    assert buffer.stats['written'] == 3
+    assert _free_slots(buffer) == QUEUE_MAX
@@ -0,0 +1,71 @@
+"""
+Difficulty calibration recovers the difficulties of simulated students' attempts
+"""
+
+import math
+import random
+from datetime import datetime
+
+import pytest
+from sqlalchemy import delete, insert, select
+
+from app import db
+from conftest import write_concept
+from models.practice import PracticeAttempt, PracticeProblem
+from models.user import User
+from services.calibration import calibrate_difficulty
+from services.content_loader import load_content
+
+np = pytest.importorskip('numpy')
+
+STUDENTS = 300
+PROBLEMS = 30
+ATTEMPTS_PER_STUDENT = 200
+
+def test_calibration_tracks_true_difficulty(app, tmp_path):
+    rng = random.Random(21)
+    stamp = f'{rng.getrandbits(32):x}'
+    write_concept(tmp_path, 'calibration-sim', 930, [
+        (f'calibration-sim-{i}', f'Calibration question {i}?', str(i)) for i in range(PROBLEMS)
+    ])
+    with app.app_context():
+        load_content(str(tmp_path))
+        problem_ids = db.session.scalars(
+            select(PracticeProblem.id).where(PracticeProblem.content_key.like('calibration-sim-%'))
+            .order_by(PracticeProblem.id)
+        ).all()
+        db.session.execute(insert(User), [
+            {'username': f'calib{stamp}x{i}', 'email': f'calib{stamp}x{i}@example.com',
+             'total_score': 0, 'concepts_completed': 0}
+            for i in range(STUDENTS)
+        ])
+        user_ids = db.session.scalars(select(User.id).where(User.username.like(f'calib{stamp}x%'))).all()
+
+        # Rasch model: P(correct) = 1 / (1 + exp(difficulty - ability))
+        difficulty = {problem_id: rng.uniform(-2, 2) for problem_id in problem_ids}
+        now = datetime.utcnow()
+        attempts = []
+        for user_id in user_ids:
+            ability = rng.gauss(0, 1)
+            for _ in range(ATTEMPTS_PER_STUDENT):
+                problem_id = rng.choice(problem_ids)
+                correct = rng.random() < 1 / (1 + math.exp(difficulty[problem_id] - ability))
+                attempts.append({'user_id': user_id, 'problem_id': problem_id, 'user_answer': 'x',
+                                 'is_correct': correct, 'time_taken': 5, 'score': 0, 'completed_at': now})
+        db.session.execute(insert(PracticeAttempt), attempts)
+        db.session.commit()
+
+        try:
+            result = calibrate_difficulty(chunk_size=10000)
+            assert result['attempts'] >= len(attempts)
+            fitted = dict(db.session.execute(
+                select(PracticeProblem.id, PracticeProblem.calibrated_difficulty)
+                .where(PracticeProblem.id.in_(problem_ids))
+            ).all())
+            true = [difficulty[problem_id] for problem_id in problem_ids]
+            estimated = [fitted[problem_id] for problem_id in problem_ids]
+            assert np.corrcoef(true, estimated)[0, 1] > 0.98
+        finally:
+            db.session.execute(delete(PracticeAttempt).where(PracticeAttempt.user_id.in_(user_ids)))
+            db.session.commit()
+            db.session.remove()
@@ -0,0 +1,80 @@
+"""
+Incremental content loading: only changed concepts are rewritten
+"""
+
+from datetime import datetime
+
+from sqlalchemy import insert, update
+
+from app import db
+from conftest import register, write_concept
+from models.concept import Concept
+from models.practice import PracticeAttempt, PracticeProblem
+from models.user import User
+from services.content_loader import load_content
+
+def _snapshot(slug):
+    concept = Concept.query.filter_by(slug=slug).one()
+    problems = {problem.id: (problem.content_key, problem.question, problem.correct_answer)
+                for problem in PracticeProblem.query.filter_by(concept_id=concept.id)}
+    return (concept.description, concept.content_hash, concept.updated_at), problems
+
+def _problem_id(key):
+    return db.session.query(PracticeProblem.id).filter_by(content_key=key).scalar()
+
+def test_only_the_edited_concept_changes(app, client, tmp_path):
+    username = register(client)
+    write_concept(tmp_path, 'loader-edited', 910, [
+        ('loader-edited-1', 'What is 2 + 2?', '4'),
+        ('loader-edited-2', 'What is 3 + 3?', '6'),
+        ('loader-edited-3', 'What is 4 + 4?', '8'),
+    ])
+    write_concept(tmp_path, 'loader-untouched', 911, [('loader-untouched-1', 'What is 5 + 5?', '10')])
+
+    with app.app_context():
+        stats = load_content(str(tmp_path))
+        assert (stats['concepts_added'], stats['problems_added']) == (2, 4)
+        untouched = _snapshot('loader-untouched')
+        kept_id, deleted_id, edited_id = (_problem_id(f'loader-edited-{i}') for i in (1, 2, 3))
+        user_id = User.query.filter_by(username=username).one().id
+        db.session.execute(insert(PracticeAttempt), [{
+            'user_id': user_id, 'problem_id': kept_id, 'user_answer': '4', 'is_correct': True,
+            'time_taken': 5, 'score': 10, 'completed_at': datetime.utcnow(),
+        }])
+        db.session.commit()
+
+        # Drop two problems (one attempted), reword one and add one
+        write_concept(tmp_path, 'loader-edited', 910, [
+            ('loader-edited-3', 'What is 4 + 4, doubled?', '16'),
+            ('loader-edited-4', 'What is 6 + 6?', '12'),
+        ])
+        stats = load_content(str(tmp_path))
+        assert stats == {'concepts_added': 0, 'concepts_updated': 1, 'problems_added': 1,
+                         'problems_updated': 1, 'problems_deleted': 1, 'kept_problems': [kept_id]}
+        assert _snapshot('loader-untouched') == untouched
+        assert db.session.get(PracticeProblem, deleted_id) is None
+        assert db.session.get(PracticeProblem, kept_id).question == 'What is 2 + 2?'
+        edited = db.session.get(PracticeProblem, edited_id)
+        assert (edited.question, edited.correct_answer) == ('What is 4 + 4, doubled?', '16')
+
+        # Nothing changed on disk, nothing to do
+        assert load_content(str(tmp_path))['concepts_updated'] == 0
+        db.session.remove()
+
+def test_rows_without_keys_are_matched_by_question(app, tmp_path):
+    problems = [('loader-legacy-1', 'What is 7 + 7?', '14'), ('loader-legacy-2', 'What is 8 + 8?', '16')]
+    write_concept(tmp_path, 'loader-legacy', 912, problems)
+    with app.app_context():
+        load_content(str(tmp_path))
+        legacy_id = _problem_id('loader-legacy-1')
+        other_id = _problem_id('loader-legacy-2')
+        # As loaded before problems had keys
+        db.session.execute(update(PracticeProblem).where(PracticeProblem.id == legacy_id).values(content_key=None))
+        db.session.commit()
+
+        write_concept(tmp_path, 'loader-legacy', 912, problems, description='Doubling')
+        stats = load_content(str(tmp_path))
+        assert (stats['problems_added'], stats['problems_updated'], stats['problems_deleted']) == (0, 2, 0)
+        assert _problem_id('loader-legacy-1') == legacy_id
+        assert _problem_id('loader-legacy-2') == other_id
+        db.session.remove()
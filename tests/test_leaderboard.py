@@ -0,0 +1,82 @@
+"""
+Leaderboard index and change log
+"""
+
+import random
+import re
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, insert
+
+from app import db
+from models.leaderboard import LeaderboardChange
+from services import leaderboard
+from services.leaderboard import ScoreIndex, prune_changes
+
+def _expected_rank(scores, user_id):
+    if user_id not in scores:
+        return None
+    return 1 + sum(1 for score in scores.values() if score > scores[user_id])
+
+def test_score_index_matches_brute_force():
+    rng = random.Random(3)
+    for _ in range(200):
+        index = ScoreIndex([(user_id, rng.choice([0, None, rng.randint(1, 50)]))
+                            for user_id in range(rng.randint(0, 40))])
+        expected = dict(index._scores)
+        for _ in range(40):
+            batch = [(rng.randrange(60), rng.choice([0, None, rng.randint(1, 80)]))
+                     for _ in range(rng.randint(1, 5))]
+            if rng.random() < 0.5:
+                index.update(batch)
+            else:
+                for user_id, score in batch:
+                    index.set(user_id, score)
+            for user_id, score in batch:
+                if score:
+                    expected[user_id] = score
+                else:
+                    expected.pop(user_id, None)
+
+            assert len(index) == len(expected)
+            for user_id in range(60):
+                assert index.rank(user_id) == _expected_rank(expected, user_id)
+            for limit in (1, 3, 100):
+                assert index.top(limit) == sorted(expected.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+def test_score_index_is_sized_by_distinct_scores():
+    index = ScoreIndex([(1, 10 ** 9), (2, 5), (3, 5)])
+    assert len(index._tree) == 3
+    index.set(4, 10 ** 12)
+    assert index.top(2) == [(4, 10 ** 12), (1, 10 ** 9)]
+    assert index.rank(2) == index.rank(3) == 3
+
+def test_prune_deletes_only_expired_changes(app):
+    with app.app_context():
+        old = datetime.utcnow() - timedelta(seconds=leaderboard.leaderboards.retention + 60)
+        ids = [db.session.execute(insert(LeaderboardChange).values(user_id=1, created_at=created_at)
+                                  .returning(LeaderboardChange.id)).scalar()
+               for created_at in (old, datetime.utcnow())]
+        db.session.commit()
+        assert prune_changes() >= 1
+        assert [row.id for row in LeaderboardChange.query.filter(LeaderboardChange.id.in_(ids))] == ids[1:]
+
+def test_answers_do_not_prune_the_change_log(app, student, monkeypatch):
+    monkeypatch.setattr(leaderboard, '_pruned_at', [float('-inf')])
+    deletes = []
+    request_thread = threading.current_thread()
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        # The background thread may prune meanwhile; only the request's own statements count
+        if threading.current_thread() is request_thread and re.match(r'\s*DELETE FROM leaderboard_change', statement):
+            deletes.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_execute)
+    try:
+        assert student.post('/practice/submit/1', json={'answer': 'x', 'time_taken': 5}).status_code == 200
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_execute)
+    assert not deletes
@@ -0,0 +1,67 @@
+"""
+Folded BKT updates against the textbook one-answer-at-a-time update
+"""
+
+import random
+
+import pytest
+
+from app import db
+from conftest import register
+from models.mastery import ConceptMastery
+from models.user import User
+from services.mastery import P_GUESS, P_INITIAL, P_LEARN, P_SLIP, apply_answers, record_mastery
+
+def bkt_step(mastery, correct):
+    """Condition on one answer, then allow for learning"""
+    if correct:
+        known = mastery * (1 - P_SLIP)
+        posterior = known / (known + (1 - mastery) * P_GUESS)
+    else:
+        known = mastery * P_SLIP
+        posterior = known / (known + (1 - mastery) * (1 - P_GUESS))
+    return posterior + (1 - posterior) * P_LEARN
+
+def bkt(mastery, outcomes):
+    mastery = P_INITIAL if mastery is None else mastery
+    for correct in outcomes:
+        mastery = bkt_step(mastery, correct)
+    return mastery
+
+def _sequences(rng, count):
+    for _ in range(count):
+        accuracy = rng.random()
+        yield [rng.random() < accuracy for _ in range(rng.randint(0, 60))]
+
+def test_folded_answers_match_step_by_step_updates():
+    rng = random.Random(22)
+    for outcomes in _sequences(rng, 500):
+        start = rng.choice([None, 0.0, 1.0, rng.random()])
+        assert apply_answers(start, outcomes) == pytest.approx(bkt(start, outcomes), abs=1e-9)
+
+def test_full_mastery_is_kept_exactly():
+    assert apply_answers(1.0, [False] * 50) == 1.0
+    assert apply_answers(0.0, [True]) == pytest.approx(P_LEARN)
+
+def test_recorded_mastery_matches_apply_answers(app, client):
+    username = register(client)
+    rng = random.Random(23)
+    with app.app_context():
+        user_id = User.query.filter_by(username=username).one().id
+        for concept_id in (1, 2, 3):
+            mastery, attempts = None, 0
+            for outcomes in _sequences(rng, 8):
+                row = record_mastery(user_id, concept_id, outcomes)
+                if not outcomes:
+                    assert row is None
+                    continue
+                # The upsert reads the stored estimate, so it continues from there
+                mastery = apply_answers(mastery, outcomes)
+                attempts += len(outcomes)
+                assert (row.concept_id, row.attempts) == (concept_id, attempts)
+                assert row.mastery == pytest.approx(mastery, abs=1e-9)
+            db.session.commit()
+            if attempts:
+                stored = ConceptMastery.query.filter_by(user_id=user_id, concept_id=concept_id).one()
+                assert (stored.mastery, stored.attempts) == (pytest.approx(mastery, abs=1e-9), attempts)
+        db.session.remove()
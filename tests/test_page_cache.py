@@ -0,0 +1,36 @@
+"""
+Validators on cached guest pages
+"""
+
+from datetime import datetime, timedelta
+
+from werkzeug.http import http_date
+
+from app import db
+from models.content import ContentVersion
+from services.page_cache import page_cache
+
+def test_last_modified_is_not_older_than_the_process(app, client):
+    # Content last changed long before this process (and its templates) started
+    with app.app_context():
+        row = db.session.get(ContentVersion, 1)
+        updated_at = row.updated_at
+        row.updated_at = datetime.utcnow() - timedelta(days=30)
+        db.session.commit()
+    page_cache.clear()
+    try:
+        response = client.get('/guest/')
+        assert response.status_code == 200
+
+        # A copy validated before this deploy must be sent again
+        stale = http_date(datetime.utcnow() - timedelta(days=29))
+        assert client.get('/guest/', headers={'If-Modified-Since': stale}).status_code == 200
+
+        current = http_date(response.last_modified)
+        assert client.get('/guest/', headers={'If-Modified-Since': current}).status_code == 304
+        assert client.get('/guest/', headers={'If-None-Match': response.get_etag()[0]}).status_code == 304
+    finally:
+        with app.app_context():
+            db.session.get(ContentVersion, 1).updated_at = updated_at
+            db.session.commit()
+        page_cache.clear()
@@ -0,0 +1,80 @@
+"""
+Drawing quizzes from the problem index, with and without a difficulty mix
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from routes.practice import _parse_mix
+from services.problem_views import ProblemIndex, ProblemView, _allocate
+
+CONCEPT = 7
+
+def _index(sizes):
+    """An index with ``sizes[difficulty]`` problems of each difficulty"""
+    ids = iter(range(1, sum(sizes.values()) + 1))
+    return ProblemIndex(
+        ProblemView(next(ids), CONCEPT, 'Q', 'fill_blank', (), difficulty, 10, 120, None)
+        for difficulty, size in sizes.items() for _ in range(size)
+    )
+
+def test_allocate_splits_by_largest_remainder():
+    assert _allocate(10, {1: 3, 2: 5, 3: 2}) == {1: 3, 2: 5, 3: 2}
+    assert _allocate(10, {1: 1, 2: 1, 3: 1}) == {1: 4, 2: 3, 3: 3}
+    rng = random.Random(20)
+    for _ in range(200):
+        weights = {d: rng.uniform(0.1, 10) for d in range(1, rng.randint(2, 6))}
+        count = rng.randint(0, 30)
+        quotas = _allocate(count, weights)
+        assert sum(quotas.values()) == count
+        total = sum(weights.values())
+        assert all(abs(quotas[d] - count * w / total) < 1 for d, w in weights.items())
+
+def test_draws_are_distinct():
+    index = _index({1: 12, 2: 12, 3: 3})
+    rng = random.Random(5)
+    for mix in (None, {1: 3, 2: 5, 3: 2}, {3: 1}, {4: 1}):
+        for count in (1, 5, 10, 26):
+            picked = index.draw(CONCEPT, count, mix, rng=rng)
+            assert len(picked) == count
+            assert len({view.id for view in picked}) == count
+
+    everything = index.draw(CONCEPT, 50, rng=rng)
+    assert sorted(view.id for view in everything) == list(range(1, 28))
+
+def test_draws_follow_the_mix():
+    index = _index({1: 20, 2: 20, 3: 20})
+    rng = random.Random(11)
+    for _ in range(50):
+        picked = index.draw(CONCEPT, 10, {1: 3, 2: 5, 3: 2}, rng=rng)
+        assert Counter(view.difficulty for view in picked) == {1: 3, 2: 5, 3: 2}
+    # Weights of zero and difficulties without problems are ignored
+    picked = index.draw(CONCEPT, 10, {1: 0, 2: 1, 9: 5}, rng=rng)
+    assert Counter(view.difficulty for view in picked) == {2: 10}
+
+def test_short_buckets_are_topped_up():
+    index = _index({1: 10, 2: 10, 3: 2})
+    rng = random.Random(3)
+    for _ in range(50):
+        picked = index.draw(CONCEPT, 10, {3: 1}, rng=rng)
+        counts = Counter(view.difficulty for view in picked)
+        assert len({view.id for view in picked}) == 10
+        assert counts[3] == 2
+        assert counts[1] + counts[2] == 8
+
+def test_parse_mix():
+    assert _parse_mix(None) is None
+    assert _parse_mix('') is None
+    assert _parse_mix('1:3,2:5,3:0.5') == {1: 3.0, 2: 5.0, 3: 0.5}
+    for value in ('1', '1:3:4', 'a:1', '1:x', '1:-1', '1:nan', '1:inf', '1:3,'):
+        with pytest.raises(ValueError):
+            _parse_mix(value)
+
+@pytest.mark.parametrize('mix', ['hard', '1:x', '1:-2', '2:nan', '1:3,,2:5'])
+def test_malformed_mix_is_a_bad_request(student, mix):
+    assert student.get(f'/practice/quiz/1?mix={mix}').status_code == 400
+
+def test_quiz_with_a_mix(student):
+    assert student.get('/practice/quiz/1?mix=1:3,2:5').status_code == 200
@@ -0,0 +1,97 @@
+"""
+The SQL-aggregated statistics page against the old Python computation
+"""
+
+import random
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from flask import template_rendered
+from sqlalchemy import insert
+
+from app import db
+from conftest import register
+from models.concept import Concept
+from models.practice import PracticeAttempt, PracticeProblem
+from models.progress import ProgressRecord
+from models.user import User
+from services.activity import rebuild_daily_activity
+
+@contextmanager
+def captured_context(app):
+    contexts = []
+
+    def record(sender, template, context, **extra):
+        contexts.append(context)
+
+    template_rendered.connect(record, app)
+    try:
+        yield contexts
+    finally:
+        template_rendered.disconnect(record, app)
+
+@pytest.fixture
+def history(app, client):
+    """A student with random progress records and attempts spread over ten weeks"""
+    username = register(client)
+    rng = random.Random(8)
+    now = datetime.utcnow()
+    with app.app_context():
+        user_id = User.query.filter_by(username=username).one().id
+        concept_ids = [concept_id for (concept_id,) in db.session.query(Concept.id)]
+        problem_ids = [problem_id for (problem_id,) in db.session.query(PracticeProblem.id)]
+        db.session.execute(insert(ProgressRecord), [
+            {'user_id': user_id, 'concept_id': concept_id, 'score': rng.randint(0, 100),
+             'attempts': rng.randint(1, 9), 'time_spent': rng.randint(0, 900),
+             'completed': False, 'last_attempt': now - timedelta(minutes=rng.randint(1, 100800))}
+            for concept_id in rng.sample(concept_ids, min(13, len(concept_ids)))
+        ])
+        attempts = []
+        for _ in range(500):
+            correct = rng.random() < 0.6
+            attempts.append({
+                'user_id': user_id, 'problem_id': rng.choice(problem_ids), 'user_answer': 'x',
+                'is_correct': correct, 'time_taken': rng.randint(1, 120),
+                'score': rng.randint(1, 15) if correct else 0,
+                'completed_at': now - timedelta(minutes=rng.randint(1, 100800)),
+            })
+        db.session.execute(insert(PracticeAttempt), attempts)
+        rebuild_daily_activity(user_id)
+        db.session.commit()
+        db.session.remove()
+    return user_id, attempts
+
+def test_stats_match_python_computation(app, client, history):
+    user_id, attempts = history
+    with captured_context(app) as contexts:
+        assert client.get('/progress/stats').status_code == 200
+    stats = contexts[0]
+
+    with app.app_context():
+        records = ProgressRecord.query.filter_by(user_id=user_id).all()
+        practice = PracticeAttempt.query.filter_by(user_id=user_id).all()
+    correct = sum(1 for attempt in practice if attempt.is_correct)
+    assert stats['total_score'] == sum(record.score for record in records)
+    assert stats['total_time'] == sum(record.time_spent for record in records)
+    assert stats['total_attempts'] == sum(record.attempts for record in records)
+    assert stats['total_practice'] == len(practice) == 500
+    assert stats['correct_answers'] == correct
+    assert stats['accuracy'] == pytest.approx(correct / len(practice) * 100)
+
+    today = datetime.utcnow().date()
+    for i, week in enumerate(stats['weekly_data']):
+        end = today - timedelta(weeks=i)
+        in_week = [a for a in attempts if end - timedelta(weeks=1) < a['completed_at'].date() <= end]
+        assert week['attempts'] == len(in_week)
+        assert week['correct'] == sum(1 for a in in_week if a['is_correct'])
+        assert week['points'] == sum(a['score'] for a in in_week)
+        assert week['time_spent'] == sum(a['time_taken'] for a in in_week)
+
+def test_stats_without_history(app, student):
+    with captured_context(app) as contexts:
+        assert student.get('/progress/stats').status_code == 200
+    stats = contexts[0]
+    assert (stats['total_score'], stats['total_time'], stats['total_attempts']) == (0, 0, 0)
+    assert (stats['total_practice'], stats['correct_answers'], stats['accuracy']) == (0, 0, 0)
+    assert all(week['attempts'] == 0 for week in stats['weekly_data'])
@@ -0,0 +1,106 @@
+"""
+Query plans of the progress, concept and practice routes
+
+Each request's statements are captured and explained with the same
+parameters. Per-user tables must be reached through an index: a full scan
+there grows with every student and every answer. Curriculum tables are
+exempt (read whole once per content version, then cached), and the
+leaderboards are built before capturing, as the initial board build reads
+every user once per process by design.
+"""
+
+import re
+import threading
+
+import pytest
+from sqlalchemy import event, text
+
+from app import db
+from conftest import register
+
+CONTENT_TABLES = {'concept', 'practice_problem', 'content_version'}
+
+REQUESTS = [
+    ('get', '/progress/', None),
+    ('get', '/progress/concept/1', None),
+    ('get', '/progress/stats', None),
+    ('get', '/progress/achievements', None),
+    ('get', '/progress/leaderboard', None),
+    ('get', '/progress/leaderboard?board=weekly', None),
+    ('get', '/progress/leaderboard?board=concept&concept=1', None),
+    ('get', '/progress/api/chart-data', None),
+    ('get', '/concepts/', None),
+    ('get', '/concepts/number_systems', None),
+    ('get', '/concepts/number_systems/practice', None),
+    ('post', '/concepts/number_systems/progress', {'score': 80, 'time_spent': 30}),
+    ('post', '/concepts/number_systems/complete', None),
+    ('get', '/practice/', None),
+    ('get', '/practice/review', None),
+    ('get', '/practice/concept/1', None),
+    ('get', '/practice/problem/1', None),
+    ('post', '/practice/submit/1', {'answer': 'x', 'time_taken': 5}),
+    ('get', '/practice/quiz/1', None),
+    ('post', '/practice/quiz/submit', {'concept_id': 1, 'answers': {'1': 'x', '2': 'y'}, 'total_time': 40}),
+    ('get', '/practice/history', None),
+]
+
+@pytest.fixture(scope='module')
+def warm_client(app):
+    """A logged-in student with some history, after one pass over every route"""
+    from services.leaderboard import leaderboards
+    client = app.test_client()
+    register(client)
+    for method, url, payload in REQUESTS:
+        getattr(client, method)(url, json=payload)
+    # Apply the change log on every request, so the sync queries are checked too
+    interval, leaderboards.sync_interval = leaderboards.sync_interval, 0
+    yield client
+    leaderboards.sync_interval = interval
+
+def _capture(app, client, method, url, payload):
+    statements = []
+    request_thread = threading.current_thread()
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        # Background folds and prunes share the engine; only the request's statements count
+        if threading.current_thread() is not request_thread:
+            return
+        if not executemany and re.match(r'\s*(SELECT|UPDATE|DELETE|WITH)\b', statement, re.I):
+            statements.append((statement, parameters))
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_execute)
+    try:
+        response = getattr(client, method)(url, json=payload)
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_execute)
+    assert response.status_code in (200, 302), (url, response.status_code)
+    return statements
+
+def _full_scans(connection, statement, parameters):
+    """Tables the plan reads in full, other than curriculum tables"""
+    if connection.dialect.name == 'postgresql':
+        lines = [row[0] for row in connection.exec_driver_sql('EXPLAIN ' + statement, parameters)]
+        tables = re.findall(r'Seq Scan on (\w+)', '\n'.join(lines))
+    else:
+        lines = [row[-1] for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters)]
+        # "SCAN t USING INDEX i" walks a whole index; only SEARCH narrows by key
+        tables = [match.group(1) for match in map(re.compile(r'SCAN (\w+)').match, lines) if match]
+    return [table for table in tables if table in db.metadata.tables and table not in CONTENT_TABLES], lines
+
+@pytest.mark.parametrize('method,url,payload', REQUESTS, ids=[f'{m} {u}' for m, u, _ in REQUESTS])
+def test_route_queries_use_indexes(app, warm_client, method, url, payload):
+    statements = _capture(app, warm_client, method, url, payload)
+    with app.app_context():
+        connection = db.session.connection()
+        if connection.dialect.name == 'postgresql':
+            # Small test tables make a sequential scan look cheapest; ask whether an index exists
+            connection.execute(text('SET LOCAL enable_seqscan = off'))
+        problems = []
+        for statement, parameters in statements:
+            scanned, plan = _full_scans(connection, statement, parameters)
+            if scanned:
+                problems.append(f'{statement}\n  ' + '\n  '.join(plan))
+        db.session.rollback()
+    assert not problems, '\n\n'.join(problems)
@@ -0,0 +1,132 @@
+"""
+Score counters under concurrent writers, folds and reads
+"""
+
+import random
+import re
+import threading
+import time
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.exc import OperationalError
+
+from app import db
+from models.user import User
+from models.score import ScoreDelta
+from services.leaderboard import record_points
+from services.score_counters import add_score_deltas, get_score_totals, fold_score_deltas
+
+WRITERS = 4
+TRANSACTIONS = 100
+USERS = 3
+
+def _commit_with_retry(write):
+    # SQLite allows one writer at a time and reports "database is locked" past its timeout
+    while True:
+        try:
+            write()
+            db.session.commit()
+            return
+        except OperationalError:
+            db.session.rollback()
+            time.sleep(random.random() * 0.01)
+
+def test_concurrent_deltas_are_neither_lost_nor_double_counted(app):
+    with app.app_context():
+        stamp = f'{time.time_ns()}'
+        db.session.execute(insert(User), [
+            {'username': f'counter{stamp}x{i}', 'email': f'counter{stamp}x{i}@example.com',
+             'total_score': 0, 'concepts_completed': 0}
+            for i in range(USERS)
+        ])
+        db.session.commit()
+        user_ids = db.session.execute(
+            select(User.id).where(User.username.like(f'counter{stamp}x%'))
+        ).scalars().all()
+        db.session.remove()
+
+    stop = threading.Event()
+    failures = []
+    regressions = []
+
+    def writer(seed):
+        rng = random.Random(seed)
+        with app.app_context():
+            try:
+                for _ in range(TRANSACTIONS):
+                    user_id = rng.choice(user_ids)
+                    _commit_with_retry(lambda: (
+                        record_points({user_id: 7}),
+                        add_score_deltas([{'user_id': user_id, 'concepts_completed': 1}]),
+                    ))
+            except Exception as error:
+                failures.append(error)
+            finally:
+                db.session.remove()
+
+    def folder():
+        with app.app_context():
+            while not stop.is_set():
+                try:
+                    fold_score_deltas(batch_size=50)
+                except OperationalError:
+                    db.session.rollback()
+                time.sleep(0.005)
+            db.session.remove()
+
+    def reader():
+        last = {user_id: (0, 0) for user_id in user_ids}
+        with app.app_context():
+            while not stop.is_set():
+                totals = get_score_totals(user_ids)
+                db.session.commit()
+                for user_id, total in totals.items():
+                    if total[0] < last[user_id][0] or total[1] < last[user_id][1]:
+                        regressions.append((user_id, last[user_id], total))
+                    last[user_id] = total
+            db.session.remove()
+
+    background = [threading.Thread(target=folder), threading.Thread(target=reader)]
+    writers = [threading.Thread(target=writer, args=(seed,)) for seed in range(WRITERS)]
+    for thread in background + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    stop.set()
+    for thread in background:
+        thread.join()
+
+    assert not failures
+    assert not regressions
+    with app.app_context():
+        totals = get_score_totals(user_ids)
+        assert sum(points for points, _ in totals.values()) == WRITERS * TRANSACTIONS * 7
+        assert sum(completed for _, completed in totals.values()) == WRITERS * TRANSACTIONS
+
+        fold_score_deltas()
+        assert db.session.query(ScoreDelta).filter(ScoreDelta.user_id.in_(user_ids)).count() == 0
+        folded = {user.id: (user.total_score, user.concepts_completed)
+                  for user in User.query.filter(User.id.in_(user_ids))}
+        assert folded == totals
+
+def test_answers_do_not_write_the_user_row(app, student):
+    updates = []
+    request_thread = threading.current_thread()
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        # The background thread folds deltas into user rows; only the requests' statements count
+        if threading.current_thread() is request_thread and re.match(r'\s*UPDATE\s+"?user"?\s', statement, re.I):
+            updates.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_execute)
+    try:
+        for problem_id in (1, 2, 3):
+            assert student.post(f'/practice/submit/{problem_id}', json={'answer': 'x', 'time_taken': 5}).status_code == 200
+        assert student.post('/practice/quiz/submit', json={
+            'concept_id': 1, 'answers': {'1': 'x', '2': 'y'}, 'total_time': 40
+        }).status_code == 200
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_execute)
+    assert not updates
@@ -0,0 +1,37 @@
+"""
+Cached progress chart series
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from services.score_series import ScoreSeries
+
+def test_applied_matches_a_fresh_series_and_leaves_the_original_alone():
+    rng = random.Random(10)
+    start = datetime(2026, 1, 1)
+    latest = {}
+    series = ScoreSeries(0, [])
+    for version in range(1, 200):
+        concept_id = rng.randrange(20)
+        last_attempt = start + timedelta(minutes=rng.randrange(100000))
+        score = rng.randint(0, 100)
+        before = (series.entries, series.totals)
+
+        updated = series.applied(version, concept_id, last_attempt, score)
+
+        assert (series.entries, series.totals) == before
+        latest[concept_id] = (concept_id, last_attempt, score)
+        expected = ScoreSeries(version, sorted(latest.values(), key=lambda entry: entry[1]))
+        assert [entry[0] for entry in updated.entries] == [entry[0] for entry in expected.entries]
+        assert updated.totals == expected.totals
+        assert updated.version == version
+        series = updated
+
+def test_chart_follows_progress_writes(student):
+    assert student.get('/progress/api/chart-data').json == []
+    student.post('/concepts/number_systems/progress', json={'score': 40, 'time_spent': 30})
+    student.post('/concepts/exponents_powers/progress', json={'score': 70, 'time_spent': 30})
+    student.post('/concepts/number_systems/progress', json={'score': 90, 'time_spent': 30})
+    points = student.get('/progress/api/chart-data').json
+    assert [point['score'] for point in points] == [70, 160]
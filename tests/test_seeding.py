@@ -0,0 +1,42 @@
+"""
+Seeding with the content pack as the read source
+"""
+
+import functools
+
+from app import db
+from conftest import write_concept
+from models.content import ContentVersion
+from models.practice import PracticeProblem
+from services import content_loader
+from services.content_pack import ContentPack
+from services.content_provider import content_provider
+from services.seeding import seed
+
+def test_seed_rebuilds_the_pack(app, tmp_path, monkeypatch):
+    content = tmp_path / 'content'
+    content.mkdir()
+    write_concept(content, 'seeded-pack', 900, [('seeded-pack-1', 'What is 6 x 7?', '42')])
+    monkeypatch.setattr(content_loader, 'content_hash', functools.partial(content_loader.content_hash, str(content)))
+    monkeypatch.setattr(content_loader, 'load_content', functools.partial(content_loader.load_content, str(content)))
+    monkeypatch.setitem(app.config, 'CONTENT_SOURCE', 'pack')
+    monkeypatch.setattr(content_provider, 'pack_path', str(tmp_path / 'content.pack'))
+
+    with app.app_context():
+        stored_hash = db.session.get(ContentVersion, 1).content_hash
+        try:
+            assert seed()
+            problem = PracticeProblem.query.filter_by(content_key='seeded-pack-1').one()
+            pack = ContentPack(content_provider.pack_path)
+            assert pack.content_version == db.session.get(ContentVersion, 1).version
+            assert pack.problem(problem.id).correct_answer == '42'
+
+            # Unchanged content leaves the pack alone
+            assert not seed()
+
+            write_concept(content, 'seeded-pack', 900, [('seeded-pack-1', 'What is 6 x 8?', '48')])
+            assert seed()
+            assert ContentPack(content_provider.pack_path).problem(problem.id).correct_answer == '48'
+        finally:
+            db.session.get(ContentVersion, 1).content_hash = stored_hash
+            db.session.commit()